@@ -0,0 +1,96 @@
+"""
+Menu cold-start benchmark: YAML parsing vs. the precompiled snapshot.
+
+    python benchmarks/menu_startup.py [--runs N]
+
+Builds a snapshot in a temporary directory, then times load_menus() both
+ways in-process and as a fresh interpreter (import + first load), which is
+what an autoscaled worker pays on start.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC))
+
+import yaml  # noqa: E402
+from backend.menu import loader  # noqa: E402
+
+COLD_START = """
+import sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {src!r})
+from pathlib import Path
+from backend.menu import loader
+{setup}
+loader.load_menus()
+print(time.perf_counter() - t0)
+"""
+
+
+def _time_in_process(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def _time_cold(setup: str, runs: int) -> float:
+    code = COLD_START.format(src=str(SRC), setup=setup)
+    samples = [
+        float(subprocess.check_output([sys.executable, "-c", code], text=True))
+        for _ in range(runs)
+    ]
+    return statistics.median(samples)
+
+
+def _load_safe_loader() -> dict:
+    # What load_menus() did before: pure-Python SafeLoader, every file
+    return {
+        key: yaml.safe_load((loader.DATA_DIR / name).read_text(encoding="utf-8"))
+        for key, name in loader.MENU_FILES.items()
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--runs", type=int, default=20)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot = Path(tmp) / loader.SNAPSHOT_NAME
+        loader.write_snapshot(snapshot)
+
+        safe_warm = _time_in_process(_load_safe_loader, args.runs)
+        yaml_warm = _time_in_process(loader.load_yaml_menus, args.runs)
+        snap_warm = _time_in_process(lambda: loader.read_snapshot(snapshot), args.runs)
+
+        # Point the cold process at an empty dir for YAML, at the snapshot otherwise
+        no_snapshot = "loader.SNAPSHOT_NAME = 'missing.snapshot'"
+        use_snapshot = (
+            f"_read = loader.read_snapshot\n"
+            f"loader.read_snapshot = lambda path=None: _read(Path({str(snapshot)!r}))"
+        )
+        yaml_cold = _time_cold(no_snapshot, max(3, args.runs // 4))
+        snap_cold = _time_cold(use_snapshot, max(3, args.runs // 4))
+
+    print(f"YAML loader: {loader._YamlLoader.__name__}")
+    print(f"{'':24}{'YAML':>10}{'snapshot':>12}{'speedup':>10}")
+    for label, before, after in (
+        ("SafeLoader (original)", safe_warm, snap_warm),
+        ("load_menus() (warm)", yaml_warm, snap_warm),
+        ("cold start (process)", yaml_cold, snap_cold),
+    ):
+        print(f"{label:24}{before * 1000:>8.2f}ms{after * 1000:>10.2f}ms{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
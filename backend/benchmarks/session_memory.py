@@ -0,0 +1,91 @@
+"""
+Session memory benchmark: pydantic Item order lines vs. OrderLine.
+
+    python benchmarks/session_memory.py [--sessions N]
+
+Builds N sessions with new_session() holding the same typical combo order
+both ways: as a list of Items (what sessions held before) and as the
+OrderState of OrderLines the app stores now. Reports the memory they take
+(tracemalloc, everything allocated while building them) and what the
+session store's estimate_size() charges.
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC))
+
+from backend.chat.session_store import estimate_size, new_session  # noqa: E402
+from backend.llm.schema import Item  # noqa: E402
+from backend.menu.catalog import get_catalog  # noqa: E402
+from backend.orders.lines import OrderLine  # noqa: E402
+from backend.orders.state import OrderState  # noqa: E402
+
+# Big Mac meal with its drink and sauce, a dessert, an extra drink, as the
+# chat handlers add them
+ORDER = [
+    ("Big Mac Meal", "combo", None),
+    ("Coca-Cola", "drink", None),
+    ("Ketchup", "sauce", None),
+    ("McFlurry with Oreo", "dessert", None),
+    ("Fanta", "drink", "large"),
+]
+
+
+def _session(make_order) -> dict:
+    catalog = get_catalog()
+    session = new_session()
+    # fresh strings per session, as parsed from model output
+    session["order"] = make_order(
+        ("".join(name), type_, size, catalog.price(name)) for name, type_, size in ORDER
+    )
+    return session
+
+
+def _items(lines) -> list:
+    return [Item(name=name, type=type_, size=size, price=price) for name, type_, size, price in lines]
+
+
+def _order_state(lines) -> OrderState:
+    return OrderState(OrderLine(*line) for line in lines)
+
+
+def _measure(make_order, sessions: int):
+    get_catalog()  # built once per worker, not charged to the sessions
+    gc.collect()
+    tracemalloc.start()
+    built = [_session(make_order) for _ in range(sessions)]
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    estimated = sum(estimate_size(s) for s in built)
+    return traced, estimated
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--sessions", type=int, default=10_000)
+    args = ap.parse_args()
+    n = args.sessions
+
+    rows = (
+        ("pydantic Item", _measure(_items, n)),
+        ("OrderState", _measure(_order_state, n)),
+    )
+    print(f"{n} sessions, {len(ORDER)} order lines each")
+    print(f"{'':16}{'traced':>12}{'per session':>14}{'estimate_size':>16}")
+    for label, (traced, estimated) in rows:
+        print(
+            f"{label:16}{traced / 2**20:>10.2f}MB{traced / n:>12.0f} B"
+            f"{estimated / 2**20:>14.2f}MB"
+        )
+    (before, est_before), (after, est_after) = (r for _, r in rows)
+    print(f"{'saved':16}{(before - after) / 2**20:>10.2f}MB{(before - after) / n:>12.0f} B"
+          f"{(est_before - est_after) / 2**20:>14.2f}MB")
+
+
+if __name__ == "__main__":
+    main()
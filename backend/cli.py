@@ -1,4 +1,5 @@
 import sys
+import asyncio
 from pathlib import Path
 from src.backend.llm.order_parser import parser_order
 from src.backend.logic.order_validator import validate_order
@@ -7,7 +8,7 @@ from src.backend.logic.order_engine import process_order_logic
 SRC = Path(__file__).parent / "src"
 sys.path.append(str(SRC))
 
-def main():
+async def main():
     print("\U0001F354 Welcome to McDonald's! What can I get you started with?")
     full_order = {
         "items": [],
@@ -29,7 +30,7 @@ def main():
             continue
 
         try:
-            parsed = parser_order(user_input)
+            parsed = await parser_order(user_input)
         except Exception as e:
             print(f"⚠️ Failed to parse message: {e}")
             continue
@@ -69,4 +70,4 @@ def main():
             break
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
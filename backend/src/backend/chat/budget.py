@@ -0,0 +1,122 @@
+"""
+Token budgets per session and per worker.
+
+Every turn's LLM token usage (from the API's usage reports, collected by
+the turn trace, or estimated for a stream cut short) is added to
+session["usage"] and to a rolling per-worker tally. Before the next turn
+the larger of the two levels decides how it is handled:
+
+- ok: as usual;
+- soft: cheap paths only. Replies come from the templates (no model
+  rephrasing or speculation), the prompt history is cut to the last few
+  messages, and a less confident fast-path parse is accepted;
+- hard: no model call at all. Turns the fast path and the templates can
+  handle (choosing a combo drink, confirming the order) go through as in
+  soft; any other message gets a fixed reply.
+
+A limit of 0 disables it.
+"""
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, Iterator, Tuple
+from backend.settings import settings
+from backend.telemetry import Trace, registry
+
+OK, SOFT, HARD = "ok", "soft", "hard"
+_RANK = {OK: 0, SOFT: 1, HARD: 2}
+
+TURNS = registry.counter(
+    "chat_budget_turns_total", "Chat turns by token budget level", ("level",)
+)
+
+
+class WorkerUsage:
+    """
+    Tokens used by this worker over the last `window` seconds.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self._events: Deque[Tuple[float, int]] = deque()
+        self._total = 0
+
+    def add(self, tokens: int) -> None:
+        if tokens:
+            self._events.append((time.monotonic(), tokens))
+            self._total += tokens
+
+    def total(self) -> int:
+        cutoff = time.monotonic() - self.window
+        while self._events and self._events[0][0] < cutoff:
+            self._total -= self._events.popleft()[1]
+        return self._total
+
+    def stats(self) -> Dict:
+        return {"window_tokens": self.total()}
+
+
+worker_usage = WorkerUsage(settings.WORKER_TOKEN_WINDOW)
+
+_level: ContextVar[str] = ContextVar("budget_level", default=OK)
+
+
+def _level_for(used: int, soft: int, hard: int) -> str:
+    if hard and used >= hard:
+        return HARD
+    if soft and used >= soft:
+        return SOFT
+    return OK
+
+
+def session_tokens(session: Dict) -> int:
+    usage = session.get("usage") or {}
+    return usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0)
+
+
+def level(session: Dict) -> str:
+    """
+    Budget level for the session's next turn: the stricter of the session
+    and worker levels.
+    """
+    session_level = _level_for(
+        session_tokens(session), settings.SESSION_TOKEN_SOFT_LIMIT, settings.SESSION_TOKEN_HARD_LIMIT
+    )
+    worker_level = _level_for(
+        worker_usage.total(), settings.WORKER_TOKEN_SOFT_LIMIT, settings.WORKER_TOKEN_HARD_LIMIT
+    )
+    return max(session_level, worker_level, key=_RANK.__getitem__)
+
+
+def current_level() -> str:
+    """
+    Budget level of the turn being handled (OK outside a turn).
+    """
+    return _level.get()
+
+
+@contextmanager
+def applied(turn_level: str) -> Iterator[None]:
+    """
+    Makes `turn_level` the current level for the duration of a turn.
+    """
+    TURNS.inc(1, turn_level)
+    token = _level.set(turn_level)
+    try:
+        yield
+    finally:
+        _level.reset(token)
+
+
+def charge(session: Dict, trace: Trace) -> None:
+    """
+    Adds the tokens a finished turn used to the session and worker tallies.
+    """
+    prompt = trace.attrs["prompt_tokens"]
+    completion = trace.attrs["completion_tokens"]
+    usage = session.setdefault("usage", {"prompt_tokens": 0, "completion_tokens": 0})
+    usage["prompt_tokens"] += prompt
+    usage["completion_tokens"] += completion
+    worker_usage.add(prompt + completion)
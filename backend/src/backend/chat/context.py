@@ -0,0 +1,94 @@
+# backend/chat/context.py
+
+from typing import Callable, Dict, List, Optional
+from backend.chat import budget
+from backend.chat.history import prompt_history
+from backend.llm.fast_parser import fast_parse
+from backend.llm.order_parser import parser_order
+from backend.llm.schema import OrderResponse
+from backend.logic.order_validator import validate_order
+from backend.menu.catalog import get_catalog
+from backend.settings import settings
+
+
+class TurnContext:
+    """
+    State for a single chat turn, shared by every handler that looks at it.
+
+    The user message is parsed and validated at most once per turn, and only
+    when a handler first asks for it. A parse failure is remembered too, so a
+    handler that retries after another one gave up gets the same error back
+    instead of paying for another LLM call.
+
+    The menu catalog is pinned when the turn starts, so a hot reload that
+    lands mid-turn never mixes old and new prices or names.
+
+    A handler changes nothing outside the session itself; effects such as
+    recording an order are registered with on_saved() and run once the
+    session is saved. A turn can then be re-run safely if the save fails.
+    """
+
+    def __init__(self, session: Dict, message: str, session_id: str):
+        self.session = session
+        self.message = message
+        self.session_id = session_id
+        self.catalog = get_catalog()
+
+        self._parsed: Optional[OrderResponse] = None
+        self._validated: Optional[Dict] = None
+        self._parse_error: Optional[Exception] = None
+        self.saved_callbacks: List[Callable[[], None]] = []
+
+    def on_saved(self, callback: Callable[[], None]) -> None:
+        """
+        Run `callback` after the turn's session has been saved.
+        """
+        self.saved_callbacks.append(callback)
+
+    async def parsed(self) -> OrderResponse:
+        """
+        Parse the message against the conversation history (once per turn).
+
+        Raises:
+            ValueError: if the model response could not be parsed.
+        """
+        if self._parse_error is not None:
+            raise self._parse_error
+        if self._parsed is None:
+            try:
+                threshold = settings.BUDGET_FAST_PARSE_THRESHOLD if self._over_budget() else None
+                self._parsed = await parser_order(self.message, history=self.prompt_history(), threshold=threshold)
+            except ValueError as e:
+                self._parse_error = e
+                raise
+        return self._parsed
+
+    def parse_needs_model(self) -> bool:
+        """
+        Whether parsing the message would call the model: the fast path is
+        not confident enough at this turn's threshold.
+        """
+        threshold = (
+            settings.BUDGET_FAST_PARSE_THRESHOLD if self._over_budget() else settings.FAST_PARSE_THRESHOLD
+        )
+        return fast_parse(self.message, self.prompt_history(), self.catalog).confidence < threshold
+
+    def prompt_history(self) -> List[dict]:
+        """
+        Bounded view of the session history to send to the model, cut
+        shorter once the session is over its soft token budget.
+        """
+        if self._over_budget():
+            return prompt_history(self.session, max_messages=settings.BUDGET_HISTORY_MESSAGES)
+        return prompt_history(self.session)
+
+    def _over_budget(self) -> bool:
+        return budget.current_level() != budget.OK
+
+    async def validated(self) -> Dict:
+        """
+        Result of validate_order() for the parsed message (once per turn).
+        """
+        if self._validated is None:
+            self._validated = validate_order(await self.parsed(), self.catalog)
+        return self._validated
@@ -0,0 +1,110 @@
+# backend/chat/dispatcher.py
+
+from types import ModuleType
+from typing import Dict, List, Optional
+from backend.chat import budget, speculation
+from backend.chat.context import TurnContext
+from backend.telemetry import current_trace, span
+from backend.chat.handlers import (
+    greeting,
+    slot,
+    add_item,
+    combo,
+    ask_upsell,
+    dessert,
+    finalize,
+    fallback,
+    exhausted,
+)
+
+# Which handler owns each parsed intent. Intents without an entry here
+# (ask_for_clarification, cancel_order, request_size, ...) go to fallback.
+INTENT_HANDLERS: Dict[str, ModuleType] = {
+    "add_item": add_item,
+    "accept_combo": combo,
+    "decline_combo": combo,
+    "request_drink": combo,
+    "ask_for_upsell": ask_upsell,
+    "accept_dessert": dessert,
+    "decline_dessert": dessert,
+    "finalize_order": finalize,
+}
+
+# When one message carries several intents, the handler listed first wins.
+# This is the order the old linear handler chain tried them in.
+_PRIORITY = (add_item, combo, ask_upsell, dessert, finalize)
+_RANK = {handler: rank for rank, handler in enumerate(_PRIORITY)}
+
+
+def _dessert_offer_due(session: Dict) -> bool:
+    """
+    The dessert handler makes a one-time offer once the order has a main.
+    That offer comes before finalizing, like at the counter.
+    """
+    return (
+        not session["upsell_flags"].get("dessert_offered_done")
+        and session["order"].count("burger", "combo") > 0
+    )
+
+
+async def select_handlers(ctx: TurnContext) -> List[ModuleType]:
+    """
+    Pick the handler(s) that own this turn, most specific first.
+
+    Session state is checked before anything is parsed, so the greeting and
+    combo-slot turns never reach the LLM. Over the hard token budget, a
+    message only the model could parse gets the exhausted handler. Otherwise the parsed intents are
+    looked up in INTENT_HANDLERS. An invalid parse belongs to add_item, which
+    knows how to rescue desserts and how to ask the customer to rephrase.
+    """
+    session = ctx.session
+    if not session["history"]:
+        return [greeting]
+    if session.get("pending_slots"):
+        return [slot]
+    if budget.current_level() == budget.HARD and ctx.parse_needs_model():
+        return [exhausted]
+
+    try:
+        validated = await ctx.validated()
+    except ValueError:
+        return []
+
+    if not validated["is_valid"]:
+        return [add_item]
+
+    owners = {INTENT_HANDLERS[i] for i in validated["intents"] if i in INTENT_HANDLERS}
+    if _dessert_offer_due(session) and not owners - {dessert, finalize}:
+        return [dessert]
+    return sorted(owners, key=_RANK.__getitem__)
+
+
+async def dispatch(ctx: TurnContext) -> Dict:
+    """
+    Run the owning handler for this turn. A handler may still decline
+    (return None), in which case the next owner or the fallback answers.
+
+    A predictable reply is started before the parse (see chat/speculation.py)
+    and used if the handler asks for it.
+    """
+    spec = speculation.start(ctx)
+    try:
+        for handler in await select_handlers(ctx):
+            result = await _run(handler, ctx)
+            if result is not None:
+                return result
+
+        return await _run(fallback, ctx)
+    finally:
+        await speculation.finish(spec)
+
+
+async def _run(handler: ModuleType, ctx: TurnContext) -> Optional[Dict]:
+    name = handler.__name__.rsplit(".", 1)[-1]
+    with span(f"handler.{name}") as s:
+        result = await handler.handle(ctx)
+        s.set(answered=result is not None)
+    trace = current_trace()
+    if trace is not None and result is not None:
+        trace.attrs["handler"] = name
+    return result
@@ -1,41 +1,15 @@
 # backend/chat/handlers/add_item.py
 
 from typing import Dict, Optional
-from backend.llm.order_parser import parser_order
-from backend.logic.order_validator import validate_order
-from backend.menu.loader import load_menus
+from backend.chat.context import TurnContext
 from backend.menu.pricing import get_price
-from backend.llm.schema import Item
+from backend.orders.lines import OrderLine
+from backend.menu.matcher import get_matcher
 
-# dessert synonyms for fallback mapping
-_DESSERT_SYNONYMS = {
-    "oreo mcflurry": "McFlurry with Oreo",
-    "mcflurry with oreo": "McFlurry with Oreo",
-    "m&m's mcflurry": "McFlurry with M&M's",
-    "soft serve cone": "Soft Serve Cone",
-    "soft serve": "Soft Serve Cone",
-    "apple pie": "Apple Pie",
-    "cookie": "Chocolate Chip Cookie",
-    "chocolate chip cookie": "Chocolate Chip Cookie",
-    "sundae": "Sundae",
-}
-
-def _all_menu_items():
-    menu = load_menus()
-    flat = []
-    # flatten every list in your menu dict
-    for v in menu.values():
-        if isinstance(v, list):
-            flat.extend(v)
-        elif isinstance(v, dict):
-            for vv in v.values():
-                if isinstance(vv, list):
-                    flat.extend(vv)
-    return flat
-
-def handle(session: Dict, message: str, session_id: str) -> Optional[Dict]:
-    parsed    = parser_order(message, history=session["history"])
-    validated = validate_order(parsed)
+async def handle(ctx: TurnContext) -> Optional[Dict]:
+    session, session_id = ctx.session, ctx.session_id
+    parsed    = await ctx.parsed()
+    validated = await ctx.validated()
 
     # — If validation failed but parser is already asking for a combo‐slot (e.g. request_drink),
     #    bail out so the combo handler can run —
@@ -53,15 +27,15 @@ def handle(session: Dict, message: str, session_id: str) -> Optional[Dict]:
 
         added_burger = None
         resp_lines   = []
-        existing     = {it.name for it in session["order"]}
+        order        = session["order"]
 
         for it in new_items:
-            if it.name not in existing:
-                it.price = get_price(it)
-                session["order"].append(it)
-                resp_lines.append(f"✅ Added: {it.name} – ${it.price:.2f}")
-                if it.type == "burger":
-                    added_burger = it
+            if it.name not in order:
+                line = OrderLine(it.name, it.type, it.size, get_price(it, ctx.catalog))
+                order.append(line)
+                resp_lines.append(f"✅ Added: {line.name} – ${line.price:.2f}")
+                if line.type == "burger":
+                    added_burger = line
 
         # burger → combo upsell
         if added_burger and not session["upsell_flags"].get("combo_offered"):
@@ -84,22 +58,16 @@ def handle(session: Dict, message: str, session_id: str) -> Optional[Dict]:
         return {"session_id": session_id, "response": msg, "finalized": False}
 
     # 2) Validation failed—but maybe they meant a dessert?
-    all_items       = _all_menu_items()
-    dessert_names   = [i["name"] for i in all_items if i.get("category")=="desserts"]
+    dessert_names   = ctx.catalog.names_in("desserts")
     parsed_desserts = [it for it in parsed.items if it.type=="dessert"]
 
     if parsed_desserts:
         added = []
         for pd in parsed_desserts:
-            key   = pd.name.lower().strip()
-            canon = (
-                _DESSERT_SYNONYMS.get(key)
-                or next((d for d in dessert_names if key in d.lower()), None)
-            )
+            canon = get_matcher(ctx.catalog).match(pd.name, among=dessert_names)
             if not canon:
                 continue
-            itm = Item(name=canon, type="dessert", size=None)
-            itm.price = get_price(itm)
+            itm = OrderLine(canon, "dessert", price=get_price(canon, ctx.catalog))
             session["order"].append(itm)
             added.append(f"{itm.name} – ${itm.price:.2f}")
 
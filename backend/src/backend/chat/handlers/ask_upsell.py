@@ -1,20 +1,21 @@
 # backend/chat/handlers/ask_upsell.py
 
 from typing import Dict, Optional
-from backend.chat.message_gen import generate_system_message
-from backend.llm.order_parser import parser_order
-from backend.logic.order_validator import validate_order
+from backend.chat.message_gen import render_message
+from backend.chat.templates import order_lines, order_summary
+from backend.chat.context import TurnContext
 from backend.logic.order_engine import process_order_logic
 
-async def handle(session: Dict, message: str, session_id: str) -> Optional[Dict]:
+async def handle(ctx: TurnContext) -> Optional[Dict]:
     """
     Handle the 'ask_for_upsell' intent by:
     1) Re-running process_order_logic on the current order to find outstanding upsells.
-    2) Generating a dynamic upsell prompt via OpenAI.
+    2) Rendering the upsell prompt (template, optionally LLM-rewritten).
     """
-    # 1) Parse & validate for intents
-    parsed = parser_order(message, history=session["history"])
-    validated = validate_order(parsed)
+    session, session_id = ctx.session, ctx.session_id
+
+    # 1) Parse & validate for intents (shared with the other handlers for this turn)
+    validated = await ctx.validated()
     if not validated["is_valid"]:
         return None
 
@@ -30,20 +31,14 @@ async def handle(session: Dict, message: str, session_id: str) -> Optional[Dict]
     for flag in result["actions"]:
         session["upsell_flags"][flag] = True
 
-    # 3) Build a concise instruction describing the needed upsell
-    #    Include current items + what the system_message suggests.
-    order_summary = ", ".join(f"{it.name} for ${it.price:.2f}" for it in session["order"])
-    instruction = (
-        "You are McBot, a friendly McDonald's assistant. "
-        f"The customer currently has: {order_summary}. "
-        "Based on this, suggest the next upsell helping them complete their order, "
-        "using the guidelines in the system message: "
-        f"\"{result['system_message']}\""
+    # 3) Suggest the next upsell alongside the current items
+    msg = await render_message(
+        ctx.prompt_history(), "upsell.suggest",
+        order_summary=order_summary(session["order"]),
+        order_lines=order_lines(session["order"]),
+        next=result["system_message"],
     )
 
-    # 4) Generate a dynamic prompt via OpenAI
-    msg = await generate_system_message(session["history"], instruction)
-
-    # 5) Record and return
+    # 4) Record and return
     session["history"].append({"role": "system", "content": msg})
     return {"session_id": session_id, "response": msg, "finalized": False}
@@ -1,22 +1,22 @@
 # backend/chat/handlers/combo.py
 
 from typing import Dict, Optional
-from backend.chat.message_gen import generate_system_message
-from backend.llm.order_parser import parser_order
-from backend.logic.order_validator import validate_order
-from backend.menu.loader import load_menus
+from backend.chat.message_gen import render_message
+from backend.chat.templates import order_lines, order_summary
+from backend.chat.context import TurnContext
 from backend.menu.pricing import get_price
 from backend.logic.order_engine import process_order_logic
 
-async def handle(session: Dict, message: str, session_id: str) -> Optional[Dict]:
+async def handle(ctx: TurnContext) -> Optional[Dict]:
     """
     Handle 'accept_combo' and 'decline_combo' intents with dynamic messaging:
     - accept_combo: upgrade a burger to a combo, seed pending_slots for drink/fries/sauces
-    - decline_combo: mark combo_offered and generate the next prompt via OpenAI
+    - decline_combo: mark combo_offered and move on to the next upsell
     """
-    # 1) Parse & validate
-    parsed = parser_order(message, history=session["history"])
-    validated = validate_order(parsed)
+    session, session_id = ctx.session, ctx.session_id
+
+    # 1) Parse & validate (shared with the other handlers for this turn)
+    validated = await ctx.validated()
     if not validated["is_valid"]:
         return None
 
@@ -24,14 +24,15 @@ async def handle(session: Dict, message: str, session_id: str) -> Optional[Dict]
 
     # 2) ACCEPT COMBO
     if "accept_combo" in intents or "request_drink" in intents:
-        combo_item = None
-        for it in session["order"]:
-            if it.type == "burger":
-                it.type = "combo"
-                it.name += " Meal" if "Meal" not in it.name else ""
-                it.price = get_price(it)
-                combo_item = it
-                break
+        # the reply is written from the history as the turn found it, which
+        # a speculative reply (chat/speculation.py) was started with too
+        history = ctx.prompt_history()
+        combo_item = session["order"].first("burger")
+        if combo_item is not None:
+            name = combo_item.name + (" Meal" if "Meal" not in combo_item.name else "")
+            session["order"].update(
+                combo_item, name=name, type="combo", price=get_price(name, ctx.catalog)
+            )
 
         if combo_item is None:
             prompt = "It doesn't look like you have a burger to turn into a combo. What else can I get for you?"
@@ -41,30 +42,25 @@ async def handle(session: Dict, message: str, session_id: str) -> Optional[Dict]
         session["upsell_flags"]["combo_offered"] = True
 
         # Prepare slots
-        menu = load_menus()
-        combo_cfg = next(c for c in menu["virtual_items"]["combos"] if c["name"] == combo_item.name)
-        slots = combo_cfg["slots"]
+        slots = ctx.catalog.combo_slots[combo_item.name]
         default_side  = slots["fries"][0]
         drink_opts    = slots["drinks"]
         sauce_opts    = slots.get("sauces", {}).get("options", [])
 
+        # plain values only, so the session can be serialized; the slot
+        # handler looks the combo's slots up in the catalog
         seq = ["drinks"] + (["sauces"] if sauce_opts else [])
         session["pending_slots"] = {
             "slot": seq[0],
-            "options": slots[seq[0]],
-            "combo": combo_item,
+            "options": list(slots[seq[0]]),
+            "combo": combo_item.name,
             "remaining": seq[1:],
-            "all": slots
         }
 
-        # Dynamic prompt
-        instruction = (
-            f"You are McBot, McDonald's assistant. The customer upgraded to a {combo_item.name} combo "
-            f"which includes {default_side} by default. Now ask which drink they'd like "
-            f"and list the options: {', '.join(drink_opts)}. "
-            f"If sauces are next, tell them they can skip by saying 'no'."
+        msg = await render_message(
+            history, "combo.accept",
+            combo=combo_item.name, side=default_side, drinks=", ".join(drink_opts),
         )
-        msg = await generate_system_message(session["history"], instruction)
         session["history"].append({"role": "system", "content": msg})
         return {"session_id": session_id, "response": msg, "finalized": False}
 
@@ -77,13 +73,12 @@ async def handle(session: Dict, message: str, session_id: str) -> Optional[Dict]
             session["upsell_flags"]
         )
 
-        order_summary = ", ".join(f"{it.name} for ${it.price:.2f}" for it in session["order"])
-        instruction = (
-            f"You are McBot. The customer kept their burger as-is. "
-            f"Their order now: {order_summary}. "
-            f"Next, {result['system_message']}"
+        msg = await render_message(
+            ctx.prompt_history(), "combo.decline",
+            order_summary=order_summary(session["order"]),
+            order_lines=order_lines(session["order"]),
+            next=result["system_message"],
         )
-        msg = await generate_system_message(session["history"], instruction)
         session["history"].append({"role": "system", "content": msg})
         return {"session_id": session_id, "response": msg, "finalized": False}
 
@@ -0,0 +1,19 @@
+from typing import Dict
+from backend.chat.context import TurnContext
+from backend.chat.message_gen import render_message
+
+async def handle(ctx: TurnContext) -> Dict:
+    """
+    The session (or this worker) is over its hard token budget and the
+    message needs the model: answer with a fixed message instead. See
+    chat/budget.py.
+    """
+    session, session_id = ctx.session, ctx.session_id
+    msg = await render_message(ctx.prompt_history(), "budget.exhausted")
+
+    session["history"].append({"role": "system", "content": msg})
+    return {
+        "session_id": session_id,
+        "response": msg,
+        "finalized": False
+    }
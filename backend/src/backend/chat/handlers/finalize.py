@@ -1,22 +1,25 @@
 import uuid
 from typing import Dict, Optional
-from backend.chat.message_gen import generate_system_message
-from backend.llm.order_parser import parser_order
-from backend.logic.order_validator import validate_order
+from backend.chat.message_gen import render_message
+from backend.chat.context import TurnContext
+from backend.logic.deals import price_order
 from backend.logic.order_engine import process_order_logic
 from backend.menu.pricing import get_price
+from backend.orders.ledger import ledger
 
-async def handle(session: Dict, message: str, session_id: str) -> Optional[Dict]:
+async def handle(ctx: TurnContext) -> Optional[Dict]:
     """
     Handle finalize_order intent:
     - Ensure there is at least one item in the session order.
     - Assign prices where missing.
     - Run through process_order_logic → expect 'complete' state.
-    - Use OpenAI to craft a dynamic confirmation summary.
+    - Price it with meals applied (logic/deals.py).
+    - Render the confirmation summary.
     """
+    session, session_id = ctx.session, ctx.session_id
+
     # Parse the message in context and check for finalize_order
-    parsed = parser_order(message, history=session["history"])
-    validated = validate_order(parsed)
+    validated = await ctx.validated()
     if not validated["is_valid"] or "finalize_order" not in validated["intents"]:
         return None
 
@@ -28,7 +31,8 @@ async def handle(session: Dict, message: str, session_id: str) -> Optional[Dict]
 
     # Ensure every item has a price
     for it in session["order"]:
-        it.price = it.price or get_price(it)
+        if not it.price:
+            session["order"].update(it, price=get_price(it, ctx.catalog))
 
     # Run the order through logic
     result = process_order_logic(
@@ -42,30 +46,36 @@ async def handle(session: Dict, message: str, session_id: str) -> Optional[Dict]
         session["history"].append({"role": "system", "content": error_msg})
         return {"session_id": session_id, "response": error_msg, "finalized": False}
 
-    # Build a dynamic confirmation using OpenAI
+    # Build the confirmation
     order_id = str(uuid.uuid4())
     items_list = result["items"]
-    total = sum(it.price or 0 for it in items_list)
+    pricing = price_order(session["order"], ctx.catalog)
+    total = pricing.total
     names = ", ".join(it.name for it in items_list)
 
-    instruction = (
-        "You are McBot, a friendly McDonald's assistant. "
-        f"Confirm the completed order with summary: {names} for a total of ${total:.2f}, "
-        "include the order ID, and thank the customer."
+    confirmation = await render_message(
+        ctx.prompt_history(), "finalize.confirm",
+        order_id=order_id, names=names, total=total,
     )
-    confirmation = await generate_system_message(session["history"], instruction)
 
     session["history"].append({"role": "system", "content": confirmation})
 
+    order = {
+        "order_id": order_id,
+        "items": [it.to_dict() for it in items_list],
+        "subtotal": pricing.subtotal,
+        "savings": pricing.savings,
+        "bundles": [bundle._asdict() for bundle in pricing.bundles],
+        "total": round(total, 2),
+        "finalized": True,
+        "session_id": session_id
+    }
+    # recorded once the session is saved, so a re-run turn places one order
+    ctx.on_saved(lambda: ledger.append(order))
+
     return {
         "session_id": session_id,
         "response": confirmation,
         "finalized": True,
-        "order": {
-            "order_id": order_id,
-            "items": [it.model_dump() for it in items_list],
-            "total": round(total, 2),
-            "finalized": True,
-            "session_id": session_id
-        }
+        "order": order,
     }
@@ -1,17 +1,15 @@
 from typing import Optional, Dict
-from backend.chat.message_gen import generate_system_message
+from backend.chat.context import TurnContext
+from backend.chat.message_gen import render_message
 
-async def handle(session: Dict, message: str, session_id: str) -> Optional[Dict]:
+async def handle(ctx: TurnContext) -> Optional[Dict]:
     """
-    If this is the first turn (empty history), dynamically generate
-    a friendly greeting and question for the user.
+    If this is the first turn (empty history), greet the user and ask
+    what they would like to order.
     """
+    session, session_id = ctx.session, ctx.session_id
     if not session["history"]:
-        instruction = (
-            "You are McBot, a friendly virtual assistant for McDonald’s. "
-            "Greet the customer warmly and ask what they would like to order."
-        )
-        greeting = await generate_system_message(session["history"], instruction)
+        greeting = await render_message(ctx.prompt_history(), "greeting")
 
         session["history"].append({"role": "system", "content": greeting})
         return {
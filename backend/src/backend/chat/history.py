@@ -0,0 +1,93 @@
+"""
+Bounded conversation history for prompts.
+
+session["history"] keeps every message, but only a trimmed view is sent to
+the model: the most recent messages verbatim, within a message cap and a
+token budget, and one system message summarizing the order state in place
+of everything older. Per-turn prompt size stays flat however long the
+conversation runs.
+"""
+
+from typing import Dict, List, Optional
+from backend.chat.templates import order_summary
+from backend.settings import settings
+
+# flags set by the handlers when something was already offered
+_OFFER_FLAGS = {
+    "combo_offered": "combo",
+    "dessert_offered": "dessert",
+    "dessert_offered_done": "dessert",
+    "sauce_offered": "sauce",
+}
+
+
+def estimate_tokens(message: dict) -> int:
+    """
+    Rough token count of one chat message (~4 characters per token plus
+    per-message overhead). Good enough for budgeting, no tokenizer needed.
+    """
+    return len(message.get("content") or "") // 4 + 4
+
+
+def summarize_state(session: Dict, folded: int) -> dict:
+    """
+    System message standing in for the `folded` oldest messages.
+
+    It is built from the structured session state rather than from the
+    folded text, so it is always accurate and always small.
+    """
+    order = order_summary(session["order"]) or "nothing yet"
+    offered = sorted({
+        label for flag, label in _OFFER_FLAGS.items()
+        if session["upsell_flags"].get(flag)
+    })
+    lines = [
+        f"Summary of the {folded} earlier messages in this conversation.",
+        f"Current order: {order}.",
+        f"Already offered: {', '.join(offered) or 'nothing'}.",
+    ]
+    slot_info = session.get("pending_slots")
+    if slot_info:
+        lines.append(f"Waiting for the customer to choose a {slot_info['slot']}.")
+    return {"role": "system", "content": " ".join(lines)}
+
+
+def prompt_history(
+    session: Dict,
+    max_messages: Optional[int] = None,
+    token_budget: Optional[int] = None,
+) -> List[dict]:
+    """
+    Trimmed view of session["history"] for prompt building.
+
+    Walks back from the newest message only as far as the limits allow, so
+    the cost does not grow with the length of the conversation.
+
+    Args:
+        session (dict): chat session
+        max_messages (int): messages kept verbatim, settings.HISTORY_MAX_MESSAGES by default
+        token_budget (int): token budget for the kept messages, settings.HISTORY_TOKEN_BUDGET by default
+
+    Returns:
+        List[dict]: optional summary message followed by the most recent messages
+    """
+    history = session["history"]
+    max_messages = settings.HISTORY_MAX_MESSAGES if max_messages is None else max_messages
+    token_budget = settings.HISTORY_TOKEN_BUDGET if token_budget is None else token_budget
+
+    kept = 0
+    used = 0
+    for message in reversed(history):
+        if kept >= max_messages:
+            break
+        cost = estimate_tokens(message)
+        if kept and used + cost > token_budget:
+            break
+        used += cost
+        kept += 1
+
+    recent = history[len(history) - kept:] if kept else []
+    folded = len(history) - kept
+    if folded:
+        return [summarize_state(session, folded)] + recent
+    return recent
@@ -1,22 +1,197 @@
-from openai import OpenAI
+import asyncio
+from contextvars import ContextVar
+from types import SimpleNamespace
+from typing import Callable, List, Optional
+from backend.chat import budget
+from backend.chat.history import estimate_tokens
+from backend.chat.templates import TEMPLATES
+from backend.llm.cache import cache_key, response_cache
+from backend.llm.client import chat_completion
 from backend.settings import settings
+from backend.telemetry import current_span, record_tokens, traced
 
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+# Set while a streaming request is handled (see ChatService.handle_stream);
+# receives the reply text as it is produced.
+token_sink: ContextVar[Optional[Callable[[str], None]]] = ContextVar("token_sink", default=None)
 
+
+def _llm_written(key: str) -> bool:
+    if budget.current_level() != budget.OK:
+        return False
+    return settings.RESPONSE_MODE == "llm" or key in settings.LLM_REWRITE_KEYS
+
+
+class _Buffer:
+    """
+    Token sink for a speculative reply: holds the text back until the reply
+    is used, then forwards it (and everything after) to the real sink.
+    """
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.sink: Optional[Callable[[str], None]] = None
+
+    def __call__(self, text: str) -> None:
+        if self.sink is None:
+            self.parts.append(text)
+        else:
+            self.sink(text)
+
+    def attach(self, sink: Callable[[str], None]) -> None:
+        for text in self.parts:
+            sink(text)
+        self.parts.clear()
+        self.sink = sink
+
+
+class Speculation:
+    """
+    A model-written reply started before the turn knows it needs it.
+
+    render_message() uses it when a handler asks for exactly this reply
+    (same history, same instruction); otherwise close() cancels it.
+    """
+
+    def __init__(self, history: list[dict], instruction: str):
+        self.history = list(history)
+        self.instruction = instruction
+        self.used = False
+        self._buffer = _Buffer()
+        self._reset = None
+
+        # the task copies the current context, so it streams into the buffer
+        reset = token_sink.set(self._buffer)
+        try:
+            self.task = asyncio.create_task(generate_system_message(self.history, instruction))
+        finally:
+            token_sink.reset(reset)
+
+    def matches(self, history: list[dict], instruction: str) -> bool:
+        return not self.used and instruction == self.instruction and history == self.history
+
+    async def result(self) -> str:
+        self.used = True
+        sink = token_sink.get()
+        if sink is not None:
+            self._buffer.attach(sink)
+        return await self.task
+
+    async def close(self) -> None:
+        if self._reset is not None:
+            _speculation.reset(self._reset)
+            self._reset = None
+        if not self.used:
+            self.task.cancel()
+            # let it wind down, and retrieve its error so none is reported
+            # as never retrieved
+            await asyncio.wait([self.task])
+            if not self.task.cancelled():
+                self.task.exception()
+
+
+_speculation: ContextVar[Optional[Speculation]] = ContextVar("speculation", default=None)
+
+
+def speculate(history: list[dict], key: str, **fields) -> Optional[Speculation]:
+    """
+    Start writing the reply for `key` now, ahead of the handler that will
+    ask for it. Only model-written replies are worth starting early;
+    template replies return None.
+
+    The speculation belongs to the current turn: await its close() when
+    the turn ends, whether or not the reply was used.
+    """
+    if not _llm_written(key):
+        return None
+    spec = Speculation(history, TEMPLATES[key].instruction.format(**fields))
+    spec._reset = _speculation.set(spec)
+    return spec
+
+@traced("generate_system_message")
 async def generate_system_message(history: list[dict], instruction: str) -> str:
     """
     Given conversation history and an instruction, produce
     a dynamic system message via the Chat API.
+
+    When a token sink is set, the completion is streamed and each piece
+    is forwarded to the sink as it arrives. Repeated prompts are answered
+    from the response cache.
     """
     messages = []
     messages.extend(history)
     messages.append({"role": "system", "content": instruction})
     messages.append({"role": "user", "content": ""})
 
-    resp = client.chat.completions.create(
-        model=settings.OPENAI_MODEL,
-        messages=messages,
-        temperature=0.7,
-        max_tokens=150,
-    )
-    return resp.choices[0].message.content.strip()
+    key = cache_key(settings.OPENAI_MODEL, messages, temperature=0.7, max_tokens=150)
+    sink = token_sink.get()
+    cached = response_cache.get(key)
+    if cached is not None:
+        current_span().set(cached=True)
+        if sink is not None:
+            sink(cached)
+        return cached
+
+    if sink is None:
+        resp = await chat_completion(
+            messages=messages,
+            temperature=0.7,
+            max_tokens=150,
+        )
+        text = resp.choices[0].message.content.strip()
+        response_cache.put(key, text)
+        return text
+
+    parts = []
+    reported = False
+    try:
+        stream = await chat_completion(
+            messages=messages,
+            temperature=0.7,
+            max_tokens=150,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        async for chunk in stream:
+            if chunk.usage is not None:
+                # the last chunk, with no choices
+                record_tokens(chunk.usage)
+                reported = True
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                sink(parts[-1])
+    finally:
+        if not reported:
+            # cut short (a discarded speculation, a dropped client): no usage
+            # report comes, but the tokens are billed, so count an estimate
+            record_tokens(SimpleNamespace(
+                prompt_tokens=sum(estimate_tokens(m) for m in messages),
+                completion_tokens=estimate_tokens({"content": "".join(parts)}) if parts else 0,
+            ))
+    text = "".join(parts).strip()
+    response_cache.put(key, text)
+    return text
+
+
+async def render_message(history: list[dict], key: str, **fields) -> str:
+    """
+    Produce the reply for a message type from chat/templates.py.
+
+    In "template" mode the template is filled in directly and no LLM call
+    is made, unless the key is listed in settings.LLM_REWRITE_KEYS. In "llm"
+    mode every reply is written by the model from the template's instruction;
+    a matching reply started by speculate() is picked up instead. A turn over
+    its soft token budget always uses the template.
+    """
+    template = TEMPLATES[key]
+    if _llm_written(key):
+        instruction = template.instruction.format(**fields)
+        spec = _speculation.get()
+        if spec is not None and spec.matches(history, instruction):
+            return await spec.result()
+        return await generate_system_message(history, instruction)
+
+    text = template.text.format(**fields)
+    sink = token_sink.get()
+    if sink is not None:
+        sink(text)
+    return text
@@ -1,49 +1,105 @@
 # backend/chat/service.py
 
+import asyncio
+import logging
 import uuid
-import inspect
-from typing import Optional, Dict
-from backend.chat.handlers import (
-    greeting,
-    slot,
-    add_item,
-    combo,
-    ask_upsell,
-    dessert,
-    finalize,
-    fallback,
+from typing import AsyncIterator, Optional, Dict
+from backend.chat import budget
+from backend.chat.context import TurnContext
+from backend.chat.dispatcher import dispatch
+from backend.chat.message_gen import token_sink
+from backend.chat.session_store import (
+    InMemorySessionStore,
+    SessionConflict,
+    SessionStore,
+    SqliteSessionStore,
+    new_session,
 )
+from backend.settings import settings
+from backend.telemetry import turn
 
-sessions: Dict[str, dict] = {}
+logger = logging.getLogger(__name__)
+
+
+def _create_store() -> SessionStore:
+    if settings.SESSION_BACKEND == "sqlite":
+        return SqliteSessionStore(
+            settings.SESSION_DB_PATH,
+            ttl=settings.SESSION_TTL,
+            cache_size=settings.SESSION_CACHE_SIZE,
+        )
+    return InMemorySessionStore(
+        ttl=settings.SESSION_TTL,
+        max_sessions=settings.SESSION_MAX_COUNT,
+        max_bytes=settings.SESSION_MAX_BYTES,
+    )
+
+
+sessions: SessionStore = _create_store()
 
 
 class ChatService:
     async def handle(self, session_id: Optional[str], message: str) -> Dict:
+        """
+        Run one turn and save the session.
+
+        With a shared session store another worker may save the same
+        session meanwhile (a double submit). A turn only changes its
+        session until it is saved (see TurnContext.on_saved), so it is then
+        re-run on the fresh session, up to settings.SESSION_SAVE_RETRIES
+        times. A streamed turn is not re-run: its reply has been sent.
+
+        Raises:
+            SessionConflict: if the session could not be saved
+        """
         sid = session_id or str(uuid.uuid4())
-        session = sessions.setdefault(sid, {
-            "history": [],
-            "order": [],
-            "upsell_flags": {},
-            "pending_slots": None,
-        })
-
-        # Try each handler in turn
-        for handler in (
-            greeting,
-            slot,
-            add_item,
-            combo,
-            ask_upsell,
-            dessert,
-            finalize,
-        ):
-            result = handler.handle(session, message, sid)
-            # if it's a coroutine, await it
-            if inspect.isawaitable(result):
-                result = await result
-
-            if result is not None:
-                return result
-
-        # Always await fallback (it's async)
-        return await fallback.handle(session, message, sid)
+        for attempt in range(settings.SESSION_SAVE_RETRIES + 1):
+            session = await sessions.get(sid) or new_session()
+
+            # One context per turn: the message is parsed at most once,
+            # however many handlers look at it
+            ctx = TurnContext(session, message, sid)
+
+            level = budget.level(session)
+            with turn() as trace, budget.applied(level):
+                trace.attrs["session_id"] = sid
+                trace.attrs["budget"] = level
+                result = await dispatch(ctx)
+            budget.charge(session, trace)
+            try:
+                await sessions.save(sid, session)
+            except SessionConflict:
+                if token_sink.get() is not None or attempt == settings.SESSION_SAVE_RETRIES:
+                    raise
+                logger.info("Session %s was saved elsewhere, re-running the turn", sid)
+                continue
+            for callback in ctx.saved_callbacks:
+                callback()
+            return result
+
+    async def handle_stream(self, session_id: Optional[str], message: str) -> AsyncIterator[Dict]:
+        """
+        Same turn as handle(), yielding reply text as it is produced:
+        {"event": "token", "text": ...} frames, then one
+        {"event": "done", **result} frame carrying the full response,
+        finalized flag and order.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        # the task copies the current context, sink included
+        reset = token_sink.set(queue.put_nowait)
+        try:
+            task = asyncio.create_task(self.handle(session_id, message))
+        finally:
+            token_sink.reset(reset)
+        task.add_done_callback(lambda _: queue.put_nowait(done))
+
+        try:
+            while (text := await queue.get()) is not done:
+                yield {"event": "token", "text": text}
+        finally:
+            if not task.done():
+                task.cancel()
+
+        yield {"event": "done", **task.result()}
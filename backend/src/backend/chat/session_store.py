@@ -0,0 +1,343 @@
+"""
+Chat session storage.
+
+ChatService talks to a SessionStore, so where sessions live (and how they
+are evicted) can change without touching the handlers.
+
+InMemorySessionStore keeps sessions in the worker process.
+SqliteSessionStore shares them between every worker using the same
+database file, so consecutive turns of a session can land on any worker.
+"""
+
+import asyncio
+import json
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple
+from backend.orders.lines import OrderLine
+from backend.orders.state import OrderState
+
+
+def new_session() -> Dict:
+    """
+    Returns an empty chat session.
+    """
+    return {
+        "history": [],
+        "order": OrderState(),
+        "upsell_flags": {},
+        "pending_slots": None,
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0},  # see chat/budget.py
+        "version": 0,  # bumped by every save to a shared store
+    }
+
+
+def dumps(session: Dict) -> bytes:
+    """
+    Compact serialized session: JSON with order lines as
+    [name, type, size, price] rows, zlib-compressed. The version is kept
+    by the store, not in the payload.
+    """
+    data = {k: v for k, v in session.items() if k != "version"}
+    data["order"] = [[line.name, line.type, line.size, line.price] for line in session["order"]]
+    return zlib.compress(json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode(), 1)
+
+
+def loads(payload: bytes, version: int = 0) -> Dict:
+    """
+    Session from dumps() output.
+    """
+    session = json.loads(zlib.decompress(payload))
+    session["order"] = OrderState(OrderLine(*row) for row in session["order"])
+    session["version"] = version
+    return session
+
+
+class SessionConflict(Exception):
+    """
+    The session was saved by another turn since it was read.
+    """
+
+
+def estimate_size(obj, _seen: Optional[set] = None) -> int:
+    """
+    Approximate resident size of a session in bytes: sys.getsizeof over
+    dicts, lists, strings and model objects, each object counted once.
+    """
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, seen) + estimate_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(estimate_size(v, seen) for v in obj)
+    elif hasattr(obj, "__dict__"):
+        size += estimate_size(vars(obj), seen)
+    elif hasattr(obj, "__slots__"):
+        size += sum(estimate_size(getattr(obj, s, None), seen) for s in obj.__slots__)
+    return size
+
+
+class SessionStore(ABC):
+    """
+    Where chat sessions live between turns.
+    """
+
+    @abstractmethod
+    async def get(self, session_id: str) -> Optional[Dict]:
+        """
+        Returns the session, or None if it does not exist (or expired).
+        """
+
+    @abstractmethod
+    async def save(self, session_id: str, session: Dict) -> None:
+        """
+        Stores the session after a turn.
+
+        Raises:
+            SessionConflict: if a shared store saw another save of the
+                session since it was read
+        """
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> None:
+        """
+        Forgets the session.
+        """
+
+    def stats(self) -> Dict:
+        """
+        Store metrics for monitoring.
+        """
+        return {}
+
+
+class _Entry(NamedTuple):
+    session: Dict
+    last_access: float
+    size: int
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Process-local store with bounded memory.
+
+    Sessions idle for longer than `ttl` seconds expire, at most
+    `max_sessions` are kept and their estimated total size stays under
+    `max_bytes`; beyond either cap the least recently used session goes.
+    Entries are kept in access order, so expiry and eviction only ever
+    look at the oldest entries. A limit of 0 disables it.
+    """
+
+    def __init__(self, ttl: float = 0, max_sessions: int = 0, max_bytes: int = 0):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._expired = 0
+        self._evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, session_id: str) -> None:
+        entry = self._entries.pop(session_id)
+        self._bytes -= entry.size
+
+    def _expire(self, now: float) -> None:
+        if not self.ttl:
+            return
+        while self._entries:
+            session_id, entry = next(iter(self._entries.items()))
+            if now - entry.last_access <= self.ttl:
+                break
+            self._drop(session_id)
+            self._expired += 1
+
+    def _evict(self) -> None:
+        while self._entries and (
+            (self.max_sessions and len(self._entries) > self.max_sessions)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            self._drop(next(iter(self._entries)))
+            self._evicted += 1
+
+    async def get(self, session_id: str) -> Optional[Dict]:
+        now = time.monotonic()
+        self._expire(now)
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return None
+        self._entries[session_id] = entry._replace(last_access=now)
+        self._entries.move_to_end(session_id)
+        return entry.session
+
+    async def save(self, session_id: str, session: Dict) -> None:
+        now = time.monotonic()
+        if session_id in self._entries:
+            self._drop(session_id)
+        size = estimate_size(session)
+        self._entries[session_id] = _Entry(session, now, size)
+        self._bytes += size
+        self._expire(now)
+        self._evict()
+
+    async def delete(self, session_id: str) -> None:
+        if session_id in self._entries:
+            self._drop(session_id)
+
+    def stats(self) -> Dict:
+        return {
+            "sessions": len(self._entries),
+            "bytes": self._bytes,
+            "expired": self._expired,
+            "evicted": self._evicted,
+        }
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id      TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    updated REAL NOT NULL,
+    data    BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated);
+"""
+
+# saves between sweeps of expired rows
+_SWEEP_EVERY = 1000
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    Sessions shared between worker processes through SQLite (WAL mode).
+
+    Writes are compare-and-set on a version number: save() succeeds only
+    if nobody saved the session since it was read, and raises
+    SessionConflict otherwise. Reads go through a local cache of the
+    sessions this worker saved last: while the stored version still
+    matches, get() returns the cached session without fetching or
+    deserializing the payload. Database calls run in worker threads, so
+    the event loop never waits on disk.
+
+    Args:
+        path (Path): database file, shared by all workers
+        ttl (float): seconds of inactivity before a session expires, 0 for never
+        cache_size (int): sessions kept in the local read cache
+    """
+
+    def __init__(self, path: Path, ttl: float = 0, cache_size: int = 1000):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.cache_size = cache_size
+
+        self._cache: "OrderedDict[str, Tuple[int, Dict]]" = OrderedDict()
+        self._local = threading.local()
+        self._saves = 0
+        self._stats = {"cache_hits": 0, "loads": 0, "conflicts": 0}
+
+        with sqlite3.connect(self.path, timeout=30) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        # one connection per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _cutoff(self) -> float:
+        return time.time() - self.ttl if self.ttl else float("-inf")
+
+    # -- database calls, run in worker threads --------------------------
+
+    def _fetch(self, session_id: str, cached_version: int) -> Optional[Tuple[int, Optional[bytes]]]:
+        # the payload is only read when the cached copy is out of date
+        row = self._conn().execute(
+            "SELECT version, CASE WHEN version = ? THEN NULL ELSE data END "
+            "FROM sessions WHERE id = ? AND updated >= ?",
+            (cached_version, session_id, self._cutoff()),
+        ).fetchone()
+        return row
+
+    def _write(self, session_id: str, version: int, payload: bytes, sweep: bool) -> Optional[int]:
+        # returns the new version, or None if the compare-and-set failed
+        conn = self._conn()
+        now = time.time()
+        if version:
+            row = conn.execute(
+                "UPDATE sessions SET version = version + 1, updated = ?, data = ? "
+                "WHERE id = ? AND version = ? RETURNING version",
+                (now, payload, session_id, version),
+            ).fetchone()
+        else:
+            # a new session may only replace an expired one
+            row = conn.execute(
+                "INSERT INTO sessions (id, version, updated, data) VALUES (?, 1, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET version = version + 1, updated = excluded.updated, "
+                "data = excluded.data WHERE updated < ? RETURNING version",
+                (session_id, now, payload, self._cutoff()),
+            ).fetchone()
+        if sweep and self.ttl:
+            conn.execute("DELETE FROM sessions WHERE updated < ?", (self._cutoff(),))
+        return row[0] if row else None
+
+    # -- SessionStore ---------------------------------------------------
+
+    async def get(self, session_id: str) -> Optional[Dict]:
+        # the cached session is handed out to one turn at a time; it comes
+        # back to the cache when that turn saves it
+        cached = self._cache.pop(session_id, None)
+        row = await asyncio.to_thread(self._fetch, session_id, cached[0] if cached else -1)
+        if row is None:
+            return None
+        version, payload = row
+        if payload is None:
+            self._stats["cache_hits"] += 1
+            return cached[1]
+        self._stats["loads"] += 1
+        return loads(payload, version)
+
+    async def save(self, session_id: str, session: Dict) -> None:
+        """
+        Raises:
+            SessionConflict: if the session was saved elsewhere since it was read
+        """
+        version = session.get("version", 0)
+        self._saves += 1
+        sweep = self._saves % _SWEEP_EVERY == 0
+        new_version = await asyncio.to_thread(self._write, session_id, version, dumps(session), sweep)
+        if new_version is None:
+            self._stats["conflicts"] += 1
+            raise SessionConflict(f"Session {session_id} changed since version {version}")
+
+        session["version"] = new_version
+        self._cache[session_id] = (session["version"], session)
+        self._cache.move_to_end(session_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def delete(self, session_id: str) -> None:
+        self._cache.pop(session_id, None)
+
+        def _delete() -> None:
+            self._conn().execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+        await asyncio.to_thread(_delete)
+
+    def stats(self) -> Dict:
+        return {"cached": len(self._cache), **self._stats}
@@ -0,0 +1,90 @@
+# backend/chat/speculation.py
+
+"""
+Speculative reply generation.
+
+A turn that needs the model twice (parse the message, then write the reply)
+normally pays for both calls one after the other. When the session state
+makes the reply predictable, the likely reply is started before the parse
+and runs alongside it. If the owning handler then asks for that exact
+reply it is used as is; if not, it is cancelled when the turn ends.
+
+Only replies written by the model are started early (see
+settings.RESPONSE_MODE and settings.LLM_REWRITE_KEYS); template replies
+cost nothing to produce after the parse.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+from backend.chat.context import TurnContext
+from backend.chat.message_gen import Speculation, speculate
+
+# started / used / discarded speculative replies, for monitoring
+stats: Dict[str, int] = {"started": 0, "used": 0, "discarded": 0}
+
+
+def _last_reply(session: Dict) -> str:
+    history = session["history"]
+    return history[-1]["content"].lower() if history else ""
+
+
+def _predict_combo_accept(ctx: TurnContext) -> Optional[Tuple[str, Dict]]:
+    """
+    The customer was just asked whether to make their burger a combo:
+    most say yes, and combo.handle will then describe the meal.
+    """
+    session = ctx.session
+    if not session["upsell_flags"].get("combo_offered") or "combo" not in _last_reply(session):
+        return None
+    burger = session["order"].first("burger")
+    if burger is None:
+        return None
+    name = burger.name if "Meal" in burger.name else burger.name + " Meal"
+    slots = ctx.catalog.combo_slots.get(name)
+    if slots is None:
+        return None
+    return "combo.accept", {
+        "combo": name,
+        "side": slots["fries"][0],
+        "drinks": ", ".join(slots["drinks"]),
+    }
+
+
+# tried in order, the first prediction wins
+PREDICTORS: List[Callable[[TurnContext], Optional[Tuple[str, Dict]]]] = [
+    _predict_combo_accept,
+]
+
+
+def start(ctx: TurnContext) -> Optional[Speculation]:
+    """
+    Start the predicted reply for this turn, if there is one.
+
+    Turns handled without a parse (greeting, combo slots) are skipped:
+    there is nothing to overlap the reply with.
+    """
+    session = ctx.session
+    if not session["history"] or session.get("pending_slots"):
+        return None
+    for predict in PREDICTORS:
+        prediction = predict(ctx)
+        if prediction is None:
+            continue
+        key, fields = prediction
+        spec = speculate(ctx.prompt_history(), key, **fields)
+        if spec is not None:
+            stats["started"] += 1
+        return spec
+    return None
+
+
+async def finish(spec: Optional[Speculation]) -> None:
+    """
+    End of turn: cancel the speculative reply if nobody used it.
+    """
+    if spec is None:
+        return
+    if spec.used:
+        stats["used"] += 1
+    else:
+        stats["discarded"] += 1
+    await spec.close()
@@ -0,0 +1,113 @@
+"""
+Reply templates for every message the handlers send.
+
+Each key maps to a ready-to-send template and to the instruction the LLM
+gets when that message type is rewritten by the model instead
+(see settings.RESPONSE_MODE and settings.LLM_REWRITE_KEYS). Both are
+str.format strings filled from the same fields.
+"""
+
+from typing import Dict, Iterable, NamedTuple
+
+
+class Template(NamedTuple):
+    text: str
+    instruction: str
+
+
+TEMPLATES: Dict[str, Template] = {
+    "greeting": Template(
+        "Welcome to McDonald's! What can I get you started with?",
+        "You are McBot, a friendly virtual assistant for McDonald’s. "
+        "Greet the customer warmly and ask what they would like to order.",
+    ),
+    "slot.reask": Template(
+        "Sorry, I didn’t catch that. Please choose one of the following {slot}: {options}",
+        "You are McBot, a helpful McDonald's assistant. "
+        "The customer was asked to choose a {slot}, but their reply "
+        "was unclear. Please ask again and list the options: {options}.",
+    ),
+    "slot.next": Template(
+        "What would you like for your {slot}? Options: {options}",
+        "You are McBot. After adding the previous item, ask the customer "
+        "what they would like for their {slot} and list options: {options}.",
+    ),
+    "slot.done": Template(
+        "Got it! {added} added to your combo.\n🧾 Current items:\n{order_lines}\n"
+        "Would you like to add anything else?",
+        "You are McBot. The customer finished customizing their combo. "
+        "You added '{added}'. The current order contains: {order_summary}. "
+        "Summarize this to the customer and ask if they’d like anything else.",
+    ),
+    "combo.accept": Template(
+        "Great choice! Your {combo} includes {side} by default.\n"
+        "Which drink would you like? Options: {drinks}",
+        "You are McBot, McDonald's assistant. The customer upgraded to a {combo} combo "
+        "which includes {side} by default. Now ask which drink they'd like "
+        "and list the options: {drinks}. "
+        "If sauces are next, tell them they can skip by saying 'no'.",
+    ),
+    "combo.decline": Template(
+        "No problem. Keeping your burger as-is.\n🧾 Current items:\n{order_lines}\n{next}",
+        "You are McBot. The customer kept their burger as-is. "
+        "Their order now: {order_summary}. "
+        "Next, {next}",
+    ),
+    "upsell.suggest": Template(
+        "🧾 Current items:\n{order_lines}\n{next}",
+        "You are McBot, a friendly McDonald's assistant. "
+        "The customer currently has: {order_summary}. "
+        "Based on this, suggest the next upsell helping them complete their order, "
+        "using the guidelines in the system message: "
+        "\"{next}\"",
+    ),
+    "dessert.offer": Template(
+        "Would you like to add a dessert? Here are our options: {desserts}",
+        "You are McBot. Suggest a dessert upsell, listing each option: {desserts}",
+    ),
+    "dessert.added": Template(
+        "Great! I've added {item} (${price:.2f}) to your order.\n🧾 Current items:\n"
+        "{order_lines}\nIs there anything else you'd like?",
+        "You added {item} (${price:.2f}). Here’s the order so far: {order_lines}. "
+        "Ask if they’d like anything else.",
+    ),
+    "dessert.reask": Template(
+        "Sure! Which dessert would you like? Options: {desserts}",
+        "You are McBot. The customer’s dessert choice was unclear. "
+        "Please ask which dessert they’d like, listing options: {desserts}",
+    ),
+    "finalize.confirm": Template(
+        "Thank you! Your order {order_id} is confirmed: {names}. "
+        "Your total is ${total:.2f}.",
+        "You are McBot, a friendly McDonald's assistant. "
+        "Confirm the completed order with summary: {names} for a total of ${total:.2f}, "
+        "include the order ID ({order_id}), and thank the customer.",
+    ),
+    "fallback.followup": Template(
+        "{next}",
+        "You are McBot, a helpful McDonald's assistant. "
+        "The customer's current order: {order_summary}. "
+        "Now {next} "
+        "Please phrase this as a friendly question.",
+    ),
+    "budget.exhausted": Template(
+        "Sorry, I can't take any more requests in this chat. "
+        "Please finish your order at the counter or start a new order.",
+        "You are McBot. Tell the customer you can't take any more requests "
+        "in this chat and ask them to finish at the counter or start a new order.",
+    ),
+}
+
+
+def order_summary(order: Iterable) -> str:
+    """
+    One-line order summary: "Big Mac for $5.99, Coca-Cola for $1.29".
+    """
+    return ", ".join(f"{it.name} for ${it.price:.2f}" for it in order)
+
+
+def order_lines(order: Iterable) -> str:
+    """
+    Bulleted order summary, one "- name: $price" line per item.
+    """
+    return "\n".join(f"- {it.name}: ${it.price:.2f}" for it in order)
@@ -0,0 +1,138 @@
+"""
+Batch order parsing for offline runs.
+
+Replaying recorded kiosk transcripts (to regression-test a menu or prompt
+change) means parsing thousands of utterances. parse_batch() runs them
+concurrently: identical (message, history) inputs are parsed once, and
+model calls (retries included) are started at most `rate` per second.
+Messages the fast path understands and cached parses make no model call,
+so they never wait. Results are yielded as they complete.
+
+    cd src && python -m backend.llm.batch transcripts.jsonl > parsed.jsonl
+
+Each input line is {"message": ..., "history": [...]} (history optional);
+each output line is {"index": ..., "order": {...}, "error": ...}.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from backend.llm.cache import cache_key
+from backend.llm.client import before_call
+from backend.llm.order_parser import parser_order
+from backend.llm.schema import OrderResponse
+from backend.settings import settings
+
+
+class BatchResult(NamedTuple):
+    index: int                      # position of the input
+    order: Optional[OrderResponse]  # None if parsing failed
+    error: Optional[Exception]
+
+
+class RateLimiter:
+    """
+    Token bucket: at most `rate` acquisitions per second on average, with
+    bursts of up to `burst`. A rate of 0 disables it.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if not self.rate:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+async def parse_batch(
+    inputs: Iterable[Tuple[str, Optional[List[dict]]]],
+    concurrency: Optional[int] = None,
+    rate: Optional[float] = None,
+) -> AsyncIterator[BatchResult]:
+    """
+    Parse many messages concurrently.
+
+    Args:
+        inputs (Iterable): (message, history) pairs; history may be None
+        concurrency (int): parses in flight, settings.BATCH_CONCURRENCY by default
+        rate (float): model calls started per second, settings.BATCH_RATE_LIMIT by default
+
+    Yields:
+        BatchResult: one per input, in completion order
+    """
+    concurrency = concurrency or settings.BATCH_CONCURRENCY
+    limiter = RateLimiter(settings.BATCH_RATE_LIMIT if rate is None else rate, burst=concurrency)
+
+    # identical inputs share one parse
+    groups: Dict[str, List[int]] = {}
+    unique: List[Tuple[str, str, Optional[List[dict]]]] = []
+    for index, (message, history) in enumerate(inputs):
+        key = cache_key("", (history or []) + [{"role": "user", "content": message}])
+        if key not in groups:
+            groups[key] = []
+            unique.append((key, message, history))
+        groups[key].append(index)
+
+    pending = iter(unique)
+    results: asyncio.Queue = asyncio.Queue()
+
+    async def worker() -> None:
+        for key, message, history in pending:
+            try:
+                outcome = (await parser_order(message, history=history), None)
+            except Exception as e:  # reported per input, the batch goes on
+                outcome = (None, e)
+            await results.put((key, outcome))
+
+    # the workers copy the current context, so their model calls wait for the limiter
+    reset = before_call.set(limiter.acquire)
+    try:
+        workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(unique)))]
+    finally:
+        before_call.reset(reset)
+    try:
+        for _ in range(len(unique)):
+            key, (order, error) = await results.get()
+            for n, index in enumerate(groups[key]):
+                # every duplicate gets its own copy to mutate
+                copy = order.model_copy(deep=True) if order is not None and n else order
+                yield BatchResult(index, copy, error)
+    finally:
+        for task in workers:
+            task.cancel()
+
+
+async def _replay(path: str, concurrency: Optional[int], rate: Optional[float]) -> None:
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    inputs = [(r["message"], r.get("history")) for r in records]
+    async for result in parse_batch(inputs, concurrency=concurrency, rate=rate):
+        print(json.dumps({
+            "index": result.index,
+            "order": result.order.model_dump() if result.order is not None else None,
+            "error": str(result.error) if result.error is not None else None,
+        }, ensure_ascii=False), flush=True)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Parse a JSONL file of messages in batch.")
+    ap.add_argument("path", help="JSONL input, one {\"message\", \"history\"} object per line")
+    ap.add_argument("--concurrency", type=int, default=None)
+    ap.add_argument("--rate", type=float, default=None, help="model calls per second, 0 for no limit")
+    args = ap.parse_args()
+    asyncio.run(_replay(args.path, args.concurrency, args.rate))
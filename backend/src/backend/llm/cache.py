@@ -0,0 +1,142 @@
+"""
+Response cache for LLM calls.
+
+Many prompts repeat exactly: the greeting (empty history, fixed
+instruction), slot re-asks, "a Big Mac please" as the first message of a
+session. The cache keys a completion on a hash of the model, the call
+parameters and the normalized prompt messages, so a repeated prompt is
+answered locally instead of by the API.
+
+Entries expire after `ttl` seconds and the least recently used ones are
+evicted beyond `max_entries` or `max_bytes`. A limit of 0 disables it.
+"""
+
+import hashlib
+import json
+import re
+import sys
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional
+from backend.settings import settings
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def cache_key(model: str, messages: List[dict], **params) -> str:
+    """
+    Hash identifying one completion request.
+
+    Whitespace is collapsed everywhere and the customer's text is also
+    lowercased, so "A Big Mac  please" and "a big mac please" share a key.
+
+    Args:
+        model (str): model name
+        messages (list): prompt messages, already trimmed to the history window
+        **params: sampling parameters that change the answer (temperature, ...)
+
+    Returns:
+        str: hex digest
+    """
+    normalized = []
+    for m in messages:
+        content = _normalize(m.get("content") or "")
+        if m.get("role") == "user":
+            content = content.lower()
+        normalized.append((m.get("role"), content))
+    payload = json.dumps([model, sorted(params.items()), normalized], ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class _Entry(NamedTuple):
+    value: str
+    expires_at: float
+    size: int
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache of completion texts with size accounting.
+    """
+
+    def __init__(self, ttl: float = 0, max_entries: int = 0, max_bytes: int = 0):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries != 0
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Returns the cached text, or None on a miss or an expired entry.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._drop(key)
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry.value
+
+    def put(self, key: str, value: str) -> None:
+        """
+        Stores a completion text, evicting the least recently used entries
+        while over a limit.
+        """
+        if not self.enabled:
+            return
+        if key in self._entries:
+            self._drop(key)
+        size = sys.getsizeof(key) + sys.getsizeof(value)
+        self._entries[key] = _Entry(value, time.monotonic() + self.ttl, size)
+        self._bytes += size
+        while self._entries and (
+            (self.max_entries and len(self._entries) > self.max_entries)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            self._drop(next(iter(self._entries)))
+            self._evicted += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict:
+        """
+        Cache metrics for monitoring.
+        """
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "evicted": self._evicted,
+        }
+
+
+response_cache = ResponseCache(
+    ttl=settings.LLM_CACHE_TTL,
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    max_bytes=settings.LLM_CACHE_MAX_BYTES,
+)
@@ -0,0 +1,95 @@
+"""
+Shared async OpenAI client.
+
+Every LLM call in the backend goes through chat_completion(), so the whole
+worker shares one connection pool and one concurrency limit, and a slow
+completion never blocks the event loop.
+"""
+
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Optional
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from openai.types.chat import ChatCompletion
+import httpx
+from backend.settings import settings
+from backend.telemetry import record_llm_call
+
+_client: Optional[AsyncOpenAI] = None
+_limiter: Optional[asyncio.Semaphore] = None
+
+# Awaited before every model call made in this context, e.g. the batch
+# runner's rate limiter (llm/batch.py)
+before_call: ContextVar[Optional[Callable[[], Awaitable[None]]]] = ContextVar("before_call", default=None)
+
+
+def get_client() -> AsyncOpenAI:
+    """
+    Returns the process-wide AsyncOpenAI client, creating it on first use.
+
+    Returns:
+        AsyncOpenAI: pooled client configured from settings
+    """
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            timeout=settings.OPENAI_TIMEOUT,
+            max_retries=settings.OPENAI_MAX_RETRIES,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.OPENAI_MAX_CONNECTIONS,
+                ),
+            ),
+        )
+    return _client
+
+
+def _get_limiter() -> asyncio.Semaphore:
+    global _limiter
+    if _limiter is None:
+        _limiter = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENCY)
+    return _limiter
+
+
+async def chat_completion(**kwargs) -> ChatCompletion:
+    """
+    Creates a chat completion, waiting for a free slot if the worker already
+    has OPENAI_MAX_CONCURRENCY requests in flight (and for before_call, if
+    set). Timeouts and retries are handled by the client. The call, its
+    latency and its token usage are recorded for the current turn and
+    /metrics.
+
+    Args:
+        **kwargs: arguments for chat.completions.create (model defaults to settings)
+
+    Returns:
+        ChatCompletion: the completion response
+    """
+    kwargs.setdefault("model", settings.OPENAI_MODEL)
+    gate = before_call.get()
+    if gate is not None:
+        await gate()
+    async with _get_limiter():
+        start = time.perf_counter()
+        try:
+            response = await get_client().chat.completions.create(**kwargs)
+        except Exception:
+            record_llm_call(time.perf_counter() - start, error=True)
+            raise
+    # a stream reports its usage in its last chunk (see generate_system_message)
+    record_llm_call(time.perf_counter() - start, getattr(response, "usage", None))
+    return response
+
+
+async def close_client() -> None:
+    """
+    Closes the pooled connections. Called on application shutdown.
+    """
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
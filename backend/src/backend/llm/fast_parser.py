@@ -0,0 +1,255 @@
+"""
+Deterministic fast-path order parser.
+
+Most turns are short and predictable ("big mac", "a large coke", "yes",
+"that's all"). fast_parse() reads them with a lexicon built from the menu
+catalog and the synonym tables, and returns an OrderResponse together with
+a confidence score. parser_order() only calls the LLM when that confidence
+is below settings.FAST_PARSE_THRESHOLD.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from backend.llm.schema import Item, OrderResponse
+from backend.logic.order_validator import validate_order
+from backend.menu.catalog import MenuCatalog, get_catalog
+from backend.menu.matcher import get_matcher, normalize as _normalize
+
+
+class FastParse(NamedTuple):
+    order: OrderResponse
+    confidence: float  # 0.0 (no idea) .. 1.0 (every word accounted for)
+
+
+_SIZED_TYPES = {"drink", "fries"}
+
+_SIZES: Dict[str, str] = {
+    "small": "small",
+    "medium": "medium",
+    "regular": "medium",
+    "large": "large",
+    "big": "large",
+}
+
+# words that carry no order information on their own
+_FILLER: Set[str] = set(
+    "a an the i d ll we can could may get have want would like "
+    "please pls me us give gimme some and also plus with one just to for "
+    "it be will take of too thanks thank you".split()
+)
+
+# whole phrases, matched longest first
+_PHRASES: Dict[str, str] = {
+    # finalize
+    "that s all": "finalize",
+    "that is all": "finalize",
+    "that s it": "finalize",
+    "that is it": "finalize",
+    "that will be all": "finalize",
+    "that ll be all": "finalize",
+    "nothing else": "finalize",
+    "i m done": "finalize",
+    "i m good": "finalize",
+    "done": "finalize",
+    "all good": "finalize",
+    # yes / no, resolved against what was just offered
+    "yes": "yes",
+    "yeah": "yes",
+    "yep": "yes",
+    "yup": "yes",
+    "sure": "yes",
+    "ok": "yes",
+    "okay": "yes",
+    "why not": "yes",
+    "no": "no",
+    "nope": "no",
+    "nah": "no",
+    "no thanks": "no",
+    "not now": "no",
+    "maybe later": "no",
+    # explicit combo answers
+    "make it a meal": "accept_combo",
+    "make it a combo": "accept_combo",
+    "make that a meal": "accept_combo",
+    "make that a combo": "accept_combo",
+    "as a meal": "accept_combo",
+    "no combo": "decline_combo",
+    "no meal": "decline_combo",
+    "just the burger": "decline_combo",
+    # explicit dessert answers
+    "no dessert": "decline_dessert",
+    "no desserts": "decline_dessert",
+}
+
+# words that mean the message needs real understanding
+_DEFER: Set[str] = set(
+    "two three four five six seven eight nine ten 2 3 4 5 6 7 8 9 10 "
+    "without extra remove cancel instead change but except".split()
+)
+
+
+class Lexicon:
+    """
+    The menu matcher's phrase table for one catalog, plus "<burger> combo"
+    for every "<burger> meal".
+    """
+
+    def __init__(self, catalog: MenuCatalog):
+        self.catalog = catalog
+        names: Dict[str, str] = dict(get_matcher(catalog).phrases)
+
+        for name in catalog.by_name:
+            norm = _normalize(name)
+            if norm.endswith(" meal"):
+                names.setdefault(norm[: -len(" meal")] + " combo", name)
+
+        self.names = names
+        self.max_len = max(len(k.split()) for k in list(names) + list(_PHRASES))
+
+    def item_type(self, name: str) -> str:
+        return get_matcher(self.catalog).item_type(name)
+
+
+_lexicon: Optional[Lexicon] = None
+
+
+def _get_lexicon(catalog: MenuCatalog) -> Lexicon:
+    # one lexicon per catalog; rebuilt after a menu reload
+    global _lexicon
+    if _lexicon is None or _lexicon.catalog is not catalog:
+        _lexicon = Lexicon(catalog)
+    return _lexicon
+
+
+# The exact questions the handlers end an offer with (chat/handlers/add_item.py,
+# chat/templates.py, logic/order_engine.py), matched against the last line of
+# the reply. Replies rewritten by the model match none of them, so a bare
+# yes/no after those is left to the LLM.
+_OFFER_QUESTIONS: List[Tuple["re.Pattern", str]] = [
+    (re.compile(r"would you like to make (?:your .+|it) a combo\?$"), "combo"),
+    (re.compile(r"would you like to add a dessert\?"), "dessert"),
+    (re.compile(
+        r"(?:would you like to add anything else|is there anything else you'd like(?: to add)?)\?$"
+    ), "more"),
+]
+
+
+def _offer_context(history: Optional[List[dict]]) -> Optional[str]:
+    """
+    What the assistant asked last: "combo", "dessert", "more" or None.
+    """
+    last = next(
+        (m["content"] for m in reversed(history or []) if m.get("role") != "user"),
+        "",
+    )
+    question = last.strip().rsplit("\n", 1)[-1].strip().lower()
+    for pattern, context in _OFFER_QUESTIONS:
+        if pattern.match(question):
+            return context
+    return None
+
+
+_ANSWERS: Dict[Tuple[str, Optional[str]], str] = {
+    ("yes", "combo"): "accept_combo",
+    ("yes", "dessert"): "accept_dessert",
+    ("no", "combo"): "decline_combo",
+    ("no", "dessert"): "decline_dessert",
+    ("no", "more"): "finalize_order",
+}
+
+
+def fast_parse(
+    message: str,
+    history: Optional[List[dict]] = None,
+    catalog: Optional[MenuCatalog] = None,
+) -> FastParse:
+    """
+    Parse a message without the LLM.
+
+    Args:
+        message (str): the customer's message
+        history (list): conversation so far, to resolve bare yes/no answers
+        catalog (MenuCatalog): menu to match against, the current one by default
+
+    Returns:
+        FastParse: parsed order and how much of the message it explains
+    """
+    lex = _get_lexicon(catalog or get_catalog())
+    tokens = _normalize(message).split()
+    empty = FastParse(OrderResponse(), 0.0)
+    if not tokens or any(t in _DEFER for t in tokens):
+        return empty
+
+    items: List[Item] = []
+    acts: List[str] = []
+    matched = unknown = 0
+    pending_size: Optional[str] = None
+    i = 0
+    while i < len(tokens):
+        for n in range(min(lex.max_len, len(tokens) - i), 0, -1):
+            phrase = " ".join(tokens[i:i + n])
+            if phrase in lex.names:
+                name = lex.names[phrase]
+                type_ = lex.item_type(name)
+                size = pending_size if type_ in _SIZED_TYPES else None
+                items.append(Item(name=name, type=type_, size=size))
+                pending_size = None
+                break
+            if phrase in _PHRASES:
+                acts.append(_PHRASES[phrase])
+                break
+            if n == 1 and phrase in _SIZES:
+                # "large coke" or "coke large"
+                if items and items[-1].type in _SIZED_TYPES and items[-1].size is None:
+                    items[-1].size = _SIZES[phrase]
+                else:
+                    pending_size = _SIZES[phrase]
+                break
+        else:
+            # fillers are free, any other unmatched word costs confidence
+            if tokens[i] not in _FILLER:
+                unknown += 1
+            i += 1
+            continue
+        matched += n
+        i += n
+
+    if not matched:
+        return empty
+    confidence = matched / (matched + unknown)
+
+    intents: List[str] = []
+    context = _offer_context(history)
+    answers_only = all(act in ("yes", "no") for act in acts)
+    for act in acts:
+        if act in ("yes", "no"):
+            if items:
+                return empty  # "big mac no ..." needs real understanding
+            if not answers_only:
+                continue  # "yes, make it a meal": the explicit phrase decides
+            intent = _ANSWERS.get((act, context))
+            if intent is None:
+                # a bare yes/no with nothing on the table to answer
+                intent = "finalize_order" if act == "no" else "ask_for_clarification"
+                confidence *= 0.5
+        elif act == "finalize":
+            intent = "finalize_order"
+        else:
+            intent = act
+        if intent not in intents:
+            intents.append(intent)
+
+    if items:
+        intents.insert(0, "add_item")
+        if any(it.type in _SIZED_TYPES and not it.size for it in items):
+            # the prompt asks the model to flag these; let it decide
+            intents.append("request_size")
+            confidence *= 0.5
+
+    if not intents:
+        return empty
+    order = OrderResponse(items=items, intents=intents)
+    if items and not validate_order(order, lex.catalog)["is_valid"]:
+        # the handlers would reject it; the model may read it better
+        confidence = 0.0
+    return FastParse(order, confidence)
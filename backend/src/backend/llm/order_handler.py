@@ -1,9 +1,6 @@
-from openai import OpenAI
-from backend.settings import settings
+from backend.llm.client import chat_completion
 
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
-
-def process_user_message(message: str) -> str:
+async def process_user_message(message: str) -> str:
     """
     The function which processes user message using gpt-4o-model.
     
@@ -13,8 +10,7 @@ def process_user_message(message: str) -> str:
     Returns:
         str: message from OpenAI
     """
-    response = client.chat.completions.create(
-        model=settings.OPENAI_MODEL,
+    response = await chat_completion(
         messages=[
             {"role": "system", "content": "You are a helpful McDonald's order assistant."},
             {"role": "user", "content": message}
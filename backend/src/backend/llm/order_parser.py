@@ -1,42 +1,182 @@
-from openai import OpenAI
-from backend.settings import settings
-from backend.llm.schema import OrderResponse
+import logging
 from pathlib import Path
-from typing import List, Dict, Optional
-import json
+from typing import List, Optional
+from backend.llm.cache import cache_key, response_cache
+from backend.llm.client import chat_completion
+from backend.llm.fast_parser import fast_parse
+from backend.llm.schema import OrderResponse
+from backend.menu.catalog import MenuCatalog, get_catalog
+from backend.menu.matcher import get_matcher, normalize
+from backend.settings import settings
+from backend.telemetry import current_span, traced
 
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+logger = logging.getLogger(__name__)
 
 PROMPT_PATH = Path(__file__).parent / "prompts" / "order_parsing.txt"
 PROMPT = PROMPT_PATH.read_text(encoding="utf-8")
 
 
-def parser_order(message: str, history: Optional[List[dict]] = None) -> OrderResponse:
+class OrderParseError(ValueError):
+    """
+    The model's answer could not be turned into an OrderResponse, even
+    after the retry. Raised once per turn (TurnContext remembers it).
+    """
+
+
+def _strict(schema: dict) -> dict:
+    # Structured outputs want every property required, no extra keys and
+    # no defaults; optional fields stay nullable through anyOf
+    if isinstance(schema, dict):
+        schema = {k: _strict(v) for k, v in schema.items() if k not in ("default", "title")}
+        if schema.get("type") == "object" and "properties" in schema:
+            schema["required"] = list(schema["properties"])
+            schema["additionalProperties"] = False
+    elif isinstance(schema, list):
+        schema = [_strict(v) for v in schema]
+    return schema
+
+
+# The reply is constrained to the OrderResponse schema by the API itself
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "order_response",
+        "strict": True,
+        "schema": _strict(OrderResponse.model_json_schema()),
+    },
+}
+
+
+# words that ask about a whole menu section ("got any desserts?")
+_SECTION_WORDS = {
+    "burger": "burgers",
+    "burgers": "burgers",
+    "drink": "drinks",
+    "drinks": "drinks",
+    "dessert": "desserts",
+    "desserts": "desserts",
+    "sauce": "sauces",
+    "sauces": "sauces",
+}
+
+
+def _menu_hint(message: str, catalog: MenuCatalog) -> Optional[dict]:
+    """
+    System message listing the few menu items this message is about, so
+    the model copies real names instead of inventing "Oreo McFlurry".
+    """
+    limit = settings.PARSE_MENU_HINTS
+    if not limit:
+        return None
+    matcher = get_matcher(catalog)
+    names = matcher.relevant(message, limit)
+    for word in normalize(message).split():
+        section = _SECTION_WORDS.get(word)
+        if section:
+            names += [n for n in catalog.names_in(section) if n not in names]
+    if not names:
+        return None
+    listed = "; ".join(f"{name} ({matcher.item_type(name)})" for name in names[:limit])
+    return {
+        "role": "system",
+        "content": "Menu items matching the next message. When the customer means one of "
+                   f"these, use its exact name and type: {listed}",
+    }
+
+
+def build_messages(
+    message: str,
+    history: Optional[List[dict]] = None,
+    catalog: Optional[MenuCatalog] = None,
+) -> List[dict]:
+    """
+    Parse prompt: the static instructions first, so every call shares the
+    same prefix, then the history, the relevant menu items and the message.
+    """
     messages = [{"role": "system", "content": PROMPT}]
     
     if history:
         messages += history  # Додаємо всі попередні повідомлення
 
+    hint = _menu_hint(message, catalog or get_catalog())
+    if hint is not None:
+        messages.append(hint)
     messages.append({"role": "user", "content": message})
+    return messages
+
+
+def _to_order(content: str) -> OrderResponse:
+    # A fresh OrderResponse per call: handlers mutate the items they get.
+    # Parsing and validation happen in one pass over the JSON text.
+    return OrderResponse.model_validate_json(content)
+
+
+@traced("parser_order")
+async def parser_order(
+    message: str,
+    history: Optional[List[dict]] = None,
+    threshold: Optional[float] = None,
+) -> OrderResponse:
+    """
+    Parse a customer message into an OrderResponse.
+
+    Short, predictable messages are read by the fast path. Otherwise the
+    model answers in the OrderResponse schema (settings.PARSE_STRUCTURED_OUTPUT);
+    an answer that still fails validation gets settings.PARSE_MAX_RETRIES
+    retries, each told what was wrong.
+
+    Args:
+        message (str): the customer message
+        history (List[dict]): prompt history
+        threshold (float): min fast-path confidence, settings.FAST_PARSE_THRESHOLD by default
+
+    Raises:
+        OrderParseError: if no valid answer came back
+    """
+    # Short, predictable messages never need the model
+    fast = fast_parse(message, history)
+    threshold = settings.FAST_PARSE_THRESHOLD if threshold is None else threshold
+    if fast.confidence >= threshold:
+        current_span().set(path="fast")
+        return fast.order
+
+    messages = build_messages(message, history)
 
-    response = client.chat.completions.create(
-        model=settings.OPENAI_MODEL,
-        messages=messages,
-        temperature=0.4,
-    )
+    # Identical prompts (same message, same history window) parse the same
+    key = cache_key(settings.OPENAI_MODEL, messages, temperature=0.4)
+    cached = response_cache.get(key)
+    if cached is not None:
+        current_span().set(path="cache")
+        return _to_order(cached)
 
-    content = response.choices[0].message.content.strip()
+    current_span().set(path="llm")
 
-    print("\n🔍 Raw LLM response:\n", content)
+    extra = {"response_format": RESPONSE_FORMAT} if settings.PARSE_STRUCTURED_OUTPUT else {}
+    content, error = "", None
+    for attempt in range(settings.PARSE_MAX_RETRIES + 1):
+        response = await chat_completion(
+            messages=messages,
+            temperature=0.4,
+            **extra,
+        )
+        choice = response.choices[0]
+        content = (choice.message.content or "").strip()
+        logger.debug("Raw LLM response: %s", content)
 
-    try:
-        parsed_json = json.loads(content)
-        for item in parsed_json.get("items", []):
-            if item.get("size") == "":
-                item["size"] = None
+        try:
+            if choice.finish_reason == "length":
+                raise ValueError("response was cut off")
+            order = _to_order(content)
+        except ValueError as e:  # pydantic's ValidationError included
+            logger.warning("Failed to parse model response (attempt %d): %s", attempt + 1, content)
+            error = e
+            messages = messages + [
+                {"role": "assistant", "content": content},
+                {"role": "system", "content": f"That was not a valid order JSON ({e}). Answer again with only the JSON object."},
+            ]
+            continue
 
-        return OrderResponse(**parsed_json)
+        response_cache.put(key, content)
+        return order
 
-    except (json.JSONDecodeError, ValueError) as e:
-        print("⚠️ Failed to parse:", content)
-        raise ValueError(f"Failed to parse model response: {e}\nRaw content: {content}")
+    raise OrderParseError(f"Failed to parse model response: {error}\nRaw content: {content}")
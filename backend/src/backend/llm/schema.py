@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, Literal, List
 
 class Item(BaseModel):
@@ -7,6 +7,12 @@ class Item(BaseModel):
     size: Optional[str] = None
     price: Optional[float] = None
 
+    @field_validator("size")
+    @classmethod
+    def _empty_size(cls, v: Optional[str]) -> Optional[str]:
+        # the model sometimes answers "" for "no size given"
+        return v or None
+
 
 class OrderResponse(BaseModel):
     items: List[Item] = Field(default_factory=list)
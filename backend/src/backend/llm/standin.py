@@ -0,0 +1,219 @@
+"""
+Local stand-in for the OpenAI chat-completions API.
+
+For benchmarks and load tests that must not hit OpenAI. It answers
+deterministically: parse prompts get OrderResponse JSON (from a script
+file, else from the fast-path parser, else a clarification request) and
+every other prompt gets a canned reply. Latency, error rate and streaming
+behave like the real API closely enough to exercise timeouts, retries and
+the SSE path.
+
+    cd src && python -m backend.llm.standin --profile typical --error-rate 0.01
+    OPENAI_BASE_URL=http://127.0.0.1:8100/v1 uvicorn backend.main:app
+
+Latency profiles are lognormal (median, sigma) in seconds; --latency-median
+and --latency-sigma override them.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from typing import Dict, NamedTuple, Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from backend.llm.fast_parser import fast_parse
+from backend.llm.schema import OrderResponse
+from backend.menu.matcher import normalize
+
+
+class LatencyProfile(NamedTuple):
+    median: float   # seconds until the full reply
+    sigma: float    # lognormal spread; 0 for a fixed latency
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median <= 0:
+            return 0.0
+        return rng.lognormvariate(math.log(self.median), self.sigma) if self.sigma else self.median
+
+
+PROFILES: Dict[str, LatencyProfile] = {
+    "instant": LatencyProfile(0.0, 0.0),
+    "fast": LatencyProfile(0.15, 0.3),
+    "typical": LatencyProfile(0.6, 0.5),
+    "slow": LatencyProfile(2.0, 0.6),
+}
+
+CANNED_REPLY = "Sure thing! Is there anything else I can get for you today?"
+
+# share of the latency spent before the first streamed token
+_FIRST_TOKEN_SHARE = 0.3
+
+
+def _is_parse_prompt(body: dict) -> bool:
+    fmt = body.get("response_format") or {}
+    if fmt.get("json_schema", {}).get("name") == "order_response":
+        return True
+    first = (body.get("messages") or [{}])[0]
+    return first.get("role") == "system" and "extract structured order" in (first.get("content") or "")
+
+
+def _tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+class StandIn:
+    """
+    Answer generator and fault injector behind the stand-in app.
+
+    Args:
+        latency (LatencyProfile): how long a completion takes
+        error_rate (float): share of requests failing with `error_status`
+        error_status (int): HTTP status of injected failures (429, 500, 503)
+        script (dict): normalized user message -> OrderResponse JSON for parse prompts
+        seed (int): seed for latency and error sampling
+    """
+
+    def __init__(
+        self,
+        latency: LatencyProfile = PROFILES["instant"],
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        script: Optional[Dict[str, dict]] = None,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.script = {normalize(k): v for k, v in (script or {}).items()}
+        self.rng = random.Random(seed)
+        self.stats = {"requests": 0, "errors": 0, "streamed": 0}
+
+    def answer(self, body: dict) -> str:
+        messages = body.get("messages") or []
+        if not _is_parse_prompt(body):
+            return CANNED_REPLY
+        user = next((m.get("content") or "" for m in reversed(messages) if m.get("role") == "user"), "")
+        scripted = self.script.get(normalize(user))
+        if scripted is not None:
+            return json.dumps(scripted)
+        order = fast_parse(user, messages[1:-1]).order
+        if not order.intents:
+            order = OrderResponse(intents=["ask_for_clarification"])
+        return order.model_dump_json()
+
+    def usage(self, body: dict, content: str) -> dict:
+        prompt = sum(_tokens(m.get("content") or "") for m in body.get("messages") or [])
+        return {
+            "prompt_tokens": prompt,
+            "completion_tokens": _tokens(content),
+            "total_tokens": prompt + _tokens(content),
+        }
+
+    def completion(self, body: dict, content: str) -> dict:
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stand-in"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": self.usage(body, content),
+        }
+
+    async def stream(self, body: dict, content: str, delay: float):
+        chunk_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        words = content.split(" ")
+        await asyncio.sleep(delay * _FIRST_TOKEN_SHARE)
+        step = delay * (1 - _FIRST_TOKEN_SHARE) / max(len(words), 1)
+        for i, word in enumerate(words):
+            chunk = {
+                "id": chunk_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": body.get("model", "stand-in"),
+                "choices": [{
+                    "index": 0,
+                    "delta": {"content": word if i == 0 else " " + word},
+                    "finish_reason": None,
+                }],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+            await asyncio.sleep(step)
+        done = dict(chunk, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        yield f"data: {json.dumps(done)}\n\n"
+        if (body.get("stream_options") or {}).get("include_usage"):
+            usage = dict(chunk, choices=[], usage=self.usage(body, content))
+            yield f"data: {json.dumps(usage)}\n\n"
+        yield "data: [DONE]\n\n"
+
+
+def create_app(standin: StandIn) -> FastAPI:
+    """
+    FastAPI app serving POST /v1/chat/completions from a StandIn.
+    """
+    app = FastAPI(title="chat-completions stand-in")
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        standin.stats["requests"] += 1
+        delay = standin.latency.sample(standin.rng)
+
+        if standin.rng.random() < standin.error_rate:
+            standin.stats["errors"] += 1
+            await asyncio.sleep(delay * _FIRST_TOKEN_SHARE)
+            return JSONResponse(
+                {"error": {"message": "Injected failure", "type": "server_error", "code": None}},
+                status_code=standin.error_status,
+            )
+
+        content = standin.answer(body)
+        if body.get("stream"):
+            standin.stats["streamed"] += 1
+            return StreamingResponse(standin.stream(body, content, delay), media_type="text/event-stream")
+        await asyncio.sleep(delay)
+        return standin.completion(body, content)
+
+    @app.get("/stats")
+    async def stats():
+        return standin.stats
+
+    return app
+
+
+def _load_script(path: Optional[str]) -> Dict[str, dict]:
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    ap = argparse.ArgumentParser(description="Run the chat-completions stand-in.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8100)
+    ap.add_argument("--profile", choices=sorted(PROFILES), default="typical")
+    ap.add_argument("--latency-median", type=float, default=None, help="seconds, overrides the profile")
+    ap.add_argument("--latency-sigma", type=float, default=None, help="lognormal sigma, overrides the profile")
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--error-status", type=int, default=500)
+    ap.add_argument("--script", help="JSON file: user message -> OrderResponse JSON")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    profile = PROFILES[args.profile]
+    profile = LatencyProfile(
+        profile.median if args.latency_median is None else args.latency_median,
+        profile.sigma if args.latency_sigma is None else args.latency_sigma,
+    )
+    app = create_app(StandIn(profile, args.error_rate, args.error_status, _load_script(args.script), args.seed))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,153 @@
+"""
+Order pricing with meals.
+
+Each order line carries its own price. price_order() finds the cheapest
+way to charge the whole order:
+
+- a combo line (a burger upgraded in the chat) includes the drink chosen
+  for its slot, which the combo flow adds as its own line, so one drink
+  per combo is not charged again; its fries are never added as a line, so
+  any fries in the order are charged;
+- a burger ordered with fries and a drink is charged as its meal (fries
+  and drink included) when that is cheaper.
+
+The double deals in menu_deals.yaml have no price, so they are not
+charged here.
+
+Promoting a burger to a meal saves the price of the sides it absorbs less
+the meal's premium. Taking the cheapest premiums and the dearest sides
+first, each further meal saves no more than the one before, so promoting
+burgers one at a time while that saves money is optimal, in O(n log n)
+for n lines. Results are cached per order content.
+"""
+
+
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from backend.menu.catalog import MenuCatalog, get_catalog
+
+_CACHE_SIZE = 1024
+
+
+class Bundle(NamedTuple):
+    name: str                 # "Big Mac Meal"
+    items: Tuple[str, ...]    # order lines it covers
+    price: float
+
+
+class Pricing(NamedTuple):
+    subtotal: float           # every line at its own price
+    total: float              # what the customer pays
+    bundles: Tuple[Bundle, ...]
+
+    @property
+    def savings(self) -> float:
+        return round(self.subtotal - self.total, 2)
+
+
+class _Problem:
+    """
+    The order split into what can be bundled and what is always charged
+    as is.
+    """
+
+    def __init__(self, lines: Iterable, catalog: MenuCatalog):
+        slots = list(catalog.combo_slots.values())
+        # sides every meal accepts; any other drink or fries is charged as is
+        meal_drinks = set.intersection(*(set(s.get("drinks", ())) for s in slots)) if slots else set()
+        meal_fries = set.intersection(*(set(s.get("fries", ())) for s in slots)) if slots else set()
+
+        self.burgers: List[Tuple[float, str]] = []
+        self.combos: List[Tuple[str, float]] = []
+        drinks: List[Tuple[float, str]] = []
+        fries: List[Tuple[float, str]] = []
+        self.fixed = 0.0
+        self.subtotal = 0.0
+
+        for line in lines:
+            price = line.price if line.price is not None else catalog.price(line.name)
+            self.subtotal += price
+            if line.type == "combo":
+                self.combos.append((line.name, price))
+            elif line.type == "burger":
+                self.burgers.append((price, line.name))
+            elif line.type == "drink" and line.name in meal_drinks:
+                drinks.append((price, line.name))
+            elif line.type == "fries" and line.name in meal_fries:
+                fries.append((price, line.name))
+            else:
+                self.fixed += price
+
+        self.drinks = sorted(drinks, reverse=True)
+        self.fries = sorted(fries, reverse=True)
+        self.meals: Dict[str, float] = {
+            name: catalog.price(f"{name} Meal")
+            for _, name in self.burgers
+            if f"{name} Meal" in catalog.combo_slots
+        }
+
+    def solve(self) -> Tuple[float, List[Bundle]]:
+        """
+        Cheapest total and the bundles that make it up.
+        """
+        bundles: List[Bundle] = []
+        total = self.subtotal
+        # each combo takes the dearest drink left
+        for i, (name, price) in enumerate(self.combos):
+            if i < len(self.drinks):
+                total -= self.drinks[i][0]
+                bundles.append(Bundle(name, (name, self.drinks[i][1]), price))
+        drinks = self.drinks[len(self.combos):]
+
+        # burgers whose meal costs least extra first, each with the dearest sides left
+        premiums = sorted(
+            (self.meals[name] - price, name)
+            for price, name in self.burgers
+            if name in self.meals
+        )
+        for (premium, name), (drink, drink_name), (fries, fries_name) in zip(premiums, drinks, self.fries):
+            saving = drink + fries - premium
+            if saving <= 0:
+                break
+            total -= saving
+            bundles.append(Bundle(f"{name} Meal", (name, drink_name, fries_name), self.meals[name]))
+        return total, bundles
+
+
+_cache: "OrderedDict[tuple, Pricing]" = OrderedDict()
+_cache_catalog: Optional[MenuCatalog] = None
+
+
+def price_order(lines: Iterable, catalog: Optional[MenuCatalog] = None) -> Pricing:
+    """
+    Cheapest total for an order, using meals.
+
+    Args:
+        lines (Iterable): order lines (name, type, price), e.g. session["order"]
+        catalog (MenuCatalog): menu with combo slots and prices, the current one by default
+
+    Returns:
+        Pricing: subtotal, total and the bundles applied
+    """
+    global _cache_catalog
+    catalog = catalog or get_catalog()
+    if _cache_catalog is not catalog:
+        # prices may have changed with a menu reload
+        _cache.clear()
+        _cache_catalog = catalog
+
+    lines = list(lines)
+    key = tuple(sorted((line.name, line.type, line.price or 0.0) for line in lines))
+    cached = _cache.get(key)
+    if cached is not None:
+        _cache.move_to_end(key)
+        return cached
+
+    problem = _Problem(lines, catalog)
+    total, bundles = problem.solve()
+    pricing = Pricing(round(problem.subtotal, 2), round(total, 2), tuple(bundles))
+
+    _cache[key] = pricing
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return pricing
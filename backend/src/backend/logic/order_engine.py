@@ -1,9 +1,16 @@
 from backend.llm.schema import Item, OrderResponse
+from backend.orders.lines import OrderLine
+from backend.orders.state import OrderState
+from backend.telemetry import traced
 from typing import List, Literal, Dict
 
+@traced("process_order_logic")
 def process_order_logic(order: dict, upsell_flags: Dict[str, bool]) -> dict:
     """
     Accepts the result of validate_order() and returns a system message + actions.
+
+    order["items"] is normally the session's OrderState, whose counters are
+    read directly; a plain list of items is aggregated first.
     """
     system_lines: List[str] = []
     actions: List[str] = []
@@ -31,35 +38,29 @@ def process_order_logic(order: dict, upsell_flags: Dict[str, bool]) -> dict:
             "intents": intents
         }
 
-    # Count items
-    burger_count = sum(1 for item in items if item.type == "burger")
-    combo_count = sum(1 for item in items if item.type == "combo")
-    dessert_included = any(item.type == "dessert" for item in items)
-    has_drink = any(item.type == "drink" for item in items)
+    # What the order calls for, kept by OrderState as lines change
+    state = items if isinstance(items, OrderState) else OrderState(
+        it if isinstance(it, OrderLine) else OrderLine.from_item(it) for it in items
+    )
+    upsells = state.upsells
 
     # === Combo upsell ===
-    if burger_count > 0 and not upsell_flags.get("combo_offered", False):
+    if "offer_combo" in upsells and not upsell_flags.get("combo_offered", False):
         actions.append("offer_combo")
         system_lines.append("Would you like to make it a combo?")
 
     # === Post-combo upsells ===
-    if combo_count > 0:
-        if not upsell_flags.get("sauce_offered", False):
-            actions.append("offer_sauce")
-            # Optional: system_lines.append("Would you like any sauce?")
-
-        if not dessert_included and not upsell_flags.get("dessert_offered", False):
-            actions.append("offer_dessert")
-            system_lines.append("Would you like to add a dessert?")
+    if "offer_sauce" in upsells and not upsell_flags.get("sauce_offered", False):
+        actions.append("offer_sauce")
+        # Optional: system_lines.append("Would you like any sauce?")
 
-        if not has_drink and not upsell_flags.get("drink_requested", False):
-            actions.append("request_drink_for_combo")
-            system_lines.append("Which drink would you like with your combo?")
+    if "offer_dessert" in upsells and not upsell_flags.get("dessert_offered", False):
+        actions.append("offer_dessert")
+        system_lines.append("Would you like to add a dessert?")
 
-    # === Double Deal ===
-    if burger_count >= 2 and not upsell_flags.get("double_deal_applied", False):
-        actions.append("apply_double_deal")
-        system_lines.append("We applied a double deal discount!")
+    if "request_drink_for_combo" in upsells and not upsell_flags.get("drink_requested", False):
+        actions.append("request_drink_for_combo")
+        system_lines.append("Which drink would you like with your combo?")
 
     # === Fallback ===
     if not system_lines:
@@ -1,16 +1,9 @@
-from backend.menu.loader import load_menus
+from backend.menu.catalog import MenuCatalog, get_catalog
+from backend.menu.matcher import get_matcher
+from backend.menu.synonyms import NAME_ALIASES as name_aliases
 from backend.llm.schema import OrderResponse, Item
-from backend.menu.pricing import get_price
-from typing import List, Dict
-
-menus = load_menus()
-
-name_aliases: Dict[str, str] = {
-    "Coke": "Coca-Cola",
-    "Sprite Zero": "Sprite",
-    "Fries": "French Fries",
-    "big drink": "Coca-Cola"
-}
+from backend.telemetry import traced
+from typing import List, Dict, Optional
 
 type_map: Dict[str, str] = {
     "burger": "burgers",
@@ -20,17 +13,21 @@ type_map: Dict[str, str] = {
     "dessert": "desserts"
 }
 
-all_items = (
-    menus["virtual_items"]["items"]
-    + menus["virtual_items"]["combos"]
-    + menus["upsells"]["items"]
-)
-item_names = {item["name"]: item for item in all_items}
 types_with_size = {"drinks", "fries"}
 
-def validate_order(order: OrderResponse) -> dict:
+
+def _sizes(entry) -> List[str]:
+    for prop in entry.get("properties", ()):
+        if prop.get("name") == "size":
+            return prop.get("values", [])
+    return []
+
+
+@traced("validate_order")
+def validate_order(order: OrderResponse, catalog: Optional[MenuCatalog] = None) -> dict:
     validated_items: List[Item] = []
     errors: List[str] = []
+    catalog = catalog or get_catalog()
 
     for item in order.items:
         name = name_aliases.get(item.name.strip().lower().capitalize(), item.name)
@@ -38,19 +35,32 @@ def validate_order(order: OrderResponse) -> dict:
         type_ = type_map.get(raw_type, raw_type)
         size = item.size
 
-        if name not in item_names:
+        entry = catalog.get(name)
+        if entry is None:
+            # misspelled by the customer ("big mak") and copied by the model
+            matched = get_matcher(catalog).match(name)
+            if matched is not None:
+                name, entry = matched, catalog.get(matched)
+        if entry is None:
             errors.append(f"Unknown item: {name}")
             continue
 
-        expected_type = item_names[name].get("category")
+        # meals are listed with the burgers but ordered as combos
+        # (the parse prompt's type, see MenuMatcher.item_type)
+        expected_type = "combos" if name in catalog.combo_slots else entry.get("category")
         if expected_type != type_:
             errors.append(f"Incorrect type for item '{name}': expected '{expected_type}', got '{type_}'")
 
         if expected_type in types_with_size:
+            sizes = _sizes(entry)
             if not size:
                 errors.append(f"Missing size for {type_} '{name}'")
+            elif sizes and size.lower() not in sizes:
+                errors.append(f"Unknown size '{size}' for {type_} '{name}': choose from {', '.join(sizes)}")
+            elif sizes:
+                size = size.lower()
 
-        price = get_price(name)
+        price = catalog.price(name)
         validated_items.append(Item(name=name, type=item.type, size=size, price=price))
 
     return {
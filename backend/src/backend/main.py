@@ -1,13 +1,39 @@
 # backend/main.py
 
-from fastapi import FastAPI, APIRouter, Depends
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
-from backend.menu.loader import load_menus
-from backend.chat.service import ChatService
-
-app = FastAPI()
+from typing import Optional
+from backend.menu.catalog import get_catalog
+from backend.menu.watcher import MenuWatcher
+from backend.chat import budget, speculation
+from backend.chat.service import ChatService, sessions
+from backend.chat.session_store import SessionConflict
+from backend.llm.cache import response_cache
+from backend.llm.client import close_client
+from backend.orders.ledger import ledger
+from backend.settings import settings
+from backend.telemetry import registry
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    watcher = MenuWatcher(settings.MENU_RELOAD_INTERVAL)
+    get_catalog()  # parse and index the menus once, before the first request
+    if settings.MENU_RELOAD_INTERVAL > 0:
+        watcher.start()
+    ledger.start()
+    yield
+    await watcher.stop()
+    ledger.stop()
+    await close_client()
+
+
+app = FastAPI(lifespan=lifespan)
 router = APIRouter()
 
 # CORS middleware
@@ -19,8 +45,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-orders: List[dict] = []
-
 class ChatRequest(BaseModel):
     session_id: Optional[str] = None
     message: str
@@ -29,19 +53,79 @@ class ChatRequest(BaseModel):
 async def chat(req: ChatRequest, svc: ChatService = Depends()):
     return await svc.handle(req.session_id, req.message)
 
+@router.post("/stream")
+async def chat_stream(req: ChatRequest, svc: ChatService = Depends()):
+    """
+    Server-sent events: "token" events with reply text as it is generated,
+    then a "done" event with the same payload POST /chat/ returns.
+    """
+    async def events():
+        try:
+            async for frame in svc.handle_stream(req.session_id, req.message):
+                event = frame.pop("event")
+                yield f"event: {event}\ndata: {json.dumps(frame)}\n\n"
+        except SessionConflict:
+            yield f"event: error\ndata: {json.dumps({'detail': _CONFLICT})}\n\n"
+        except Exception:
+            yield f"event: error\ndata: {json.dumps({'detail': 'Internal error'})}\n\n"
+            raise
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 app.include_router(router, prefix="/chat", tags=["chat"])
 
+_CONFLICT = "The session was updated by another request, please retry"
+
+@app.exception_handler(SessionConflict)
+async def session_conflict(request, exc: SessionConflict):
+    return JSONResponse({"detail": _CONFLICT}, status_code=409)
+
 @app.get("/")
 def root():
     return {"message": "Backend is working!"}
 
+registry.add_collector("chat_sessions", "Session store state", lambda: sessions.stats())
+registry.add_collector("llm_cache", "LLM response cache state", lambda: response_cache.stats())
+registry.add_collector("chat_speculation", "Speculative replies", lambda: speculation.stats)
+registry.add_collector("llm_worker", "Tokens used by this worker in the budget window", budget.worker_usage.stats)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Prometheus scrape endpoint: turn, step and LLM latency histograms,
+    LLM call and token counters, cache and session gauges. Per worker.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/menus")
 def get_menus():
-    return load_menus()
+    return get_catalog().menus
 
 @app.get("/orders")
-def get_orders():
-    return orders
+def get_orders(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    session_id: Optional[str] = None,
+):
+    """
+    Finalized orders, newest first, as {"orders": [...], "next_cursor": ...}.
+    Pass the returned next_cursor to get the following page. since and
+    until without a timezone are read as UTC.
+    """
+    return ledger.query(limit=limit, cursor=cursor, since=since, until=until, session_id=session_id)
+
+@app.get("/orders/{order_id}")
+def get_order(order_id: str):
+    order = ledger.get(order_id)
+    if order is None:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return order
 
 
 # @app.post("/chat")
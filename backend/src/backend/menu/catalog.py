@@ -0,0 +1,160 @@
+"""
+In-memory menu catalog.
+
+The YAML menus are parsed once and indexed, so a menu lookup on the request
+path is a dict hit instead of disk I/O plus YAML parsing.
+"""
+
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from backend.menu.loader import load_menus
+
+
+class MenuCatalog:
+    """
+    Immutable, indexed view of the menus returned by load_menus().
+
+    Orderable items are taken from virtual_items (items and combos) and
+    upsells (items), later files winning on duplicate names. Virtual
+    entries such as "drink" or "burger" are kept apart in `virtual`.
+    Every orderable item gets an ID (see item_id()).
+
+    Attributes:
+        menus (dict): raw menus, as served by the /menus endpoint
+        by_name (Mapping[str, Mapping]): orderable item entry by exact name
+        by_category (Mapping[str, Tuple[str, ...]]): item names per category
+        combo_slots (Mapping[str, Mapping]): slot options per combo name
+        prices (Mapping[str, float]): price per item name
+        virtual (Mapping[str, Tuple[str, ...]]): possible items per virtual name
+    """
+
+    __slots__ = ("menus", "by_name", "by_category", "combo_slots", "prices", "virtual")
+
+    def __init__(self, menus: dict):
+        by_name: Dict[str, Mapping] = {}
+        virtual: Dict[str, Tuple[str, ...]] = {}
+
+        for entry in (
+            menus["virtual_items"]["items"]
+            + menus["virtual_items"]["combos"]
+            + menus["upsells"]["items"]
+        ):
+            if entry.get("virtual"):
+                virtual[entry["name"]] = tuple(entry.get("possible_items", ()))
+            else:
+                by_name[entry["name"]] = MappingProxyType(dict(entry))
+
+        by_category: Dict[str, List[str]] = {}
+        for name, entry in by_name.items():
+            by_category.setdefault(entry.get("category"), []).append(name)
+
+        combo_slots = {
+            combo["name"]: MappingProxyType(combo["slots"])
+            for combo in menus["virtual_items"]["combos"]
+            if not combo.get("virtual")
+        }
+
+        _register(by_name)
+
+        object.__setattr__(self, "menus", menus)
+        object.__setattr__(self, "by_name", MappingProxyType(by_name))
+        object.__setattr__(self, "by_category", MappingProxyType(
+            {cat: tuple(names) for cat, names in by_category.items()}
+        ))
+        object.__setattr__(self, "combo_slots", MappingProxyType(combo_slots))
+        object.__setattr__(self, "prices", MappingProxyType(
+            {name: entry.get("price", 0.0) for name, entry in by_name.items()}
+        ))
+        object.__setattr__(self, "virtual", MappingProxyType(virtual))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("MenuCatalog is immutable")
+
+    def get(self, name: str) -> Optional[Mapping]:
+        """
+        Returns the menu entry for an exact item name, or None.
+        """
+        return self.by_name.get(name)
+
+    def price(self, name: str) -> float:
+        """
+        Returns the price of an item, 0.0 for unknown names.
+        """
+        return round(self.prices.get(name, 0.0), 2)
+
+    def names_in(self, category: str) -> Tuple[str, ...]:
+        """
+        Returns the item names in a category (e.g. "desserts"), in menu order.
+        """
+        return self.by_category.get(category, ())
+
+
+# Item IDs are given to names as they first appear in a catalog and never
+# reused, so an ID taken from an older catalog still resolves after a reload.
+# The table only holds names some menu listed.
+_item_ids: Dict[str, int] = {}
+_item_names: List[str] = []
+
+
+def _register(names: Iterable[str]) -> None:
+    for name in names:
+        if name not in _item_ids:
+            # name first, so a reader never sees an ID without one
+            _item_names.append(name)
+            _item_ids[name] = len(_item_names) - 1
+
+
+def item_id(name: str) -> Optional[int]:
+    """
+    Returns the ID of a menu item name, or None for a name no menu listed.
+    """
+    return _item_ids.get(name)
+
+
+def item_name(id_: int) -> str:
+    """
+    Returns the item name for an ID from item_id().
+    """
+    return _item_names[id_]
+
+
+_catalog: Optional[MenuCatalog] = None
+
+
+def build_catalog() -> MenuCatalog:
+    """
+    Reads the menu files and builds a fresh catalog.
+
+    Returns:
+        MenuCatalog: the new catalog
+    """
+    return MenuCatalog(load_menus())
+
+
+def get_catalog() -> MenuCatalog:
+    """
+    Returns the process-wide catalog, building it on first use.
+
+    Callers that need several lookups to agree (e.g. one chat turn) should
+    keep the returned object rather than calling this again, since a reload
+    may swap in a new catalog at any time.
+
+    Returns:
+        MenuCatalog: the current catalog
+    """
+    global _catalog
+    if _catalog is None:
+        _catalog = build_catalog()
+    return _catalog
+
+
+def set_catalog(catalog: MenuCatalog) -> None:
+    """
+    Atomically replaces the process-wide catalog. Readers holding the old
+    one keep using it until they are done.
+
+    Args:
+        catalog (MenuCatalog): fully built replacement
+    """
+    global _catalog
+    _catalog = catalog
@@ -1,16 +1,40 @@
 """
 Menus loader module
+
+The menus live in YAML under DATA_DIR. Parsing them is the slowest part of a
+cold start, so a build step can compile them into a pickle snapshot:
+
+    python -m backend.menu.loader
+
+load_menus() uses the snapshot while its content hash still matches the
+YAML files, and falls back to parsing the YAML otherwise.
 """
 
+import hashlib
+import os
+import pickle
 from pathlib import Path
+from typing import Optional
 import yaml
 
 DATA_DIR = Path(__file__).resolve().parent.parent / 'data'
+SNAPSHOT_NAME = 'menus.snapshot'
+SNAPSHOT_VERSION = 1
+
+MENU_FILES = {
+    'deals': 'menu_deals.yaml',
+    'ingredients': 'menu_ingredients.yaml',
+    'upsells': 'menu_upsells.yaml',
+    'virtual_items': 'menu_virtual_items.yaml',
+}
+
+# libyaml's C loader is several times faster when PyYAML was built with it
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
 def load_yaml_file(name: str) -> dict:
     """
     Loader of yaml files. Takes the name of the file and returns dictionary
-    of content. 
+    of content.
 
     Args:
         name (str): filename
@@ -21,18 +45,94 @@ def load_yaml_file(name: str) -> dict:
     path_to_menu = DATA_DIR / name
 
     with open(path_to_menu, 'r', encoding='utf-8') as file:
-        return yaml.safe_load(file)
+        return yaml.load(file, Loader=_YamlLoader)
+
+def content_hash(data_dir: Optional[Path] = None) -> str:
+    """
+    Hash of the names and contents of every menu YAML file.
+
+    Args:
+        data_dir (Path): directory holding the menu files, DATA_DIR by default
+
+    Returns:
+        str: hex sha256 digest
+    """
+    data_dir = data_dir or DATA_DIR
+    digest = hashlib.sha256()
+    for path in sorted(data_dir.glob('*.yaml')):
+        digest.update(path.name.encode('utf-8'))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+def load_yaml_menus() -> dict:
+    """
+    Parses the menu YAML files, ignoring any snapshot.
+
+    Returns:
+        dict: menus dictionary
+    """
+    return {key: load_yaml_file(name) for key, name in MENU_FILES.items()}
+
+def write_snapshot(path: Optional[Path] = None) -> str:
+    """
+    Compiles the YAML menus into a snapshot file. The file is written next
+    to its final name and renamed, so readers never see a partial snapshot.
+
+    Args:
+        path (Path): snapshot location, DATA_DIR / SNAPSHOT_NAME by default
+
+    Returns:
+        str: content hash the snapshot was built from
+    """
+    path = path or DATA_DIR / SNAPSHOT_NAME
+    digest = content_hash()
+    payload = {'version': SNAPSHOT_VERSION, 'hash': digest, 'menus': load_yaml_menus()}
+
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp, 'wb') as file:
+        pickle.dump(payload, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    return digest
+
+def read_snapshot(path: Optional[Path] = None) -> Optional[dict]:
+    """
+    Reads the menus from a snapshot if it matches the current YAML files.
+    The snapshot is a local build artifact, never user input.
+
+    Args:
+        path (Path): snapshot location, DATA_DIR / SNAPSHOT_NAME by default
+
+    Returns:
+        Optional[dict]: menus dictionary, or None if missing or stale
+    """
+    path = path or DATA_DIR / SNAPSHOT_NAME
+    try:
+        with open(path, 'rb') as file:
+            payload = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+    if (
+        not isinstance(payload, dict)
+        or payload.get('version') != SNAPSHOT_VERSION
+        or payload.get('hash') != content_hash()
+    ):
+        return None
+    return payload['menus']
 
 def load_menus():
     """
-    Loads given menus into dictionary format.
+    Loads given menus into dictionary format, from the snapshot when it is
+    fresh and from the YAML files otherwise.
 
     Returns:
         dict: menus dictionary
     """
-    return {
-        'deals': load_yaml_file('menu_deals.yaml'),
-        'ingredients': load_yaml_file('menu_ingredients.yaml'),
-        'upsells': load_yaml_file('menu_upsells.yaml'),
-        'virtual_items': load_yaml_file('menu_virtual_items.yaml')
-    }
+    menus = read_snapshot()
+    if menus is None:
+        menus = load_yaml_menus()
+    return menus
+
+
+if __name__ == '__main__':
+    print(f"Menu snapshot written ({write_snapshot()[:12]})")
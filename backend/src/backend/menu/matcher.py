@@ -0,0 +1,212 @@
+"""
+Menu name matcher.
+
+One table of every way to say a menu item (catalog names, combo slot
+options and the synonym tables), normalized once per catalog, with a
+trigram index over it for typo-tolerant lookup. "Sprit" finds Sprite and
+"big mak" finds Big Mac in microseconds, without an LLM call.
+
+Lookup order: exact name or alias, then the closest name within a small
+edit distance, then a unique name containing the text ("oreo").
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+from backend.menu.catalog import MenuCatalog, get_catalog
+from backend.menu.synonyms import SLOT_SYNONYMS, DESSERT_SYNONYMS, DESSERT_TEXT_SYNONYMS, NAME_ALIASES
+
+# fuzzy candidates checked with the full edit distance, best trigram overlap first
+_MAX_CANDIDATES = 8
+# share of a name's trigrams a message must contain for relevant() to list it
+_MIN_COVERAGE = 0.5
+
+# catalog category -> Item.type, as the parsing prompt names them
+CATEGORY_TYPES: Dict[str, str] = {
+    "burgers": "burger",
+    "drinks": "drink",
+    "fries": "fries",
+    "desserts": "dessert",
+    "sauces": "sauce",
+}
+
+
+def normalize(text: str) -> str:
+    """
+    Lowercase, punctuation to spaces, single-spaced: "Coca-Cola!" -> "coca cola".
+    """
+    t = re.sub(r"[^a-z0-9&]+", " ", text.lower().replace("’", "'"))
+    return re.sub(r"\s+", " ", t).strip()
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _max_distance(text: str) -> int:
+    # one typo in a short word, two in a longer name, three in a long phrase
+    if len(text) < 4:
+        return 0
+    if len(text) <= 6:
+        return 1
+    return 2 if len(text) <= 12 else 3
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Levenshtein distance between a and b, or limit + 1 once it is
+    certain to exceed limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+
+class MenuMatcher:
+    """
+    Normalized phrase -> canonical menu name table for one catalog, with
+    a trigram index for fuzzy lookup.
+
+    Attributes:
+        phrases (Dict[str, str]): every known phrase, normalized, to its item name
+    """
+
+    def __init__(self, catalog: MenuCatalog):
+        self.catalog = catalog
+        phrases: Dict[str, str] = {}
+
+        names = list(catalog.by_name)
+        for slots in catalog.combo_slots.values():
+            for options in slots.values():
+                names.extend(options.get("options", ()) if isinstance(options, dict) else options)
+        for name in names:
+            phrases.setdefault(normalize(name), name)
+
+        for table in (SLOT_SYNONYMS, DESSERT_SYNONYMS, DESSERT_TEXT_SYNONYMS, NAME_ALIASES):
+            for alias, canon in table.items():
+                if canon in catalog.by_name:
+                    phrases.setdefault(normalize(alias), canon)
+
+        self.phrases = phrases
+        self._keys: List[str] = list(phrases)
+        self._index: Dict[str, List[int]] = {}
+        self._sizes: List[int] = []
+        for i, key in enumerate(self._keys):
+            grams = _trigrams(key)
+            self._sizes.append(len(grams))
+            for gram in grams:
+                self._index.setdefault(gram, []).append(i)
+
+    def item_type(self, name: str) -> str:
+        """
+        Item.type for a menu item: "combo", "burger", "drink", ... This is
+        the type validate_order() accepts; the parse prompt's menu hint
+        lists it.
+        """
+        if name in self.catalog.combo_slots:
+            return "combo"
+        entry = self.catalog.by_name.get(name) or {}
+        return CATEGORY_TYPES.get(entry.get("category"), "")
+
+    def relevant(self, text: str, limit: int) -> List[str]:
+        """
+        Item names a whole message most likely refers to, best first.
+
+        A name is scored by how many of its trigrams (or an alias's) occur
+        anywhere in the message, so "two big macs and an oreo flurry"
+        brings up Big Mac and McFlurry with Oreo.
+
+        Args:
+            text (str): the customer's message
+            limit (int): max names returned
+
+        Returns:
+            List[str]: canonical item names
+        """
+        overlap = Counter()
+        for gram in _trigrams(normalize(text)):
+            for i in self._index.get(gram, ()):
+                overlap[i] += 1
+        scores: Dict[str, float] = {}
+        for i, shared in overlap.items():
+            coverage = shared / self._sizes[i]
+            if coverage >= _MIN_COVERAGE:
+                name = self.phrases[self._keys[i]]
+                scores[name] = max(scores.get(name, 0.0), coverage)
+        return sorted(scores, key=lambda name: -scores[name])[:limit]
+
+    def match(self, text: str, among: Optional[Iterable[str]] = None) -> Optional[str]:
+        """
+        Returns the menu item name `text` refers to, or None.
+
+        Args:
+            text (str): what the customer (or the model) wrote
+            among (Iterable[str]): only consider these item names, e.g. the
+                options of a combo slot
+
+        Returns:
+            str or None: canonical item name
+        """
+        query = normalize(text)
+        if not query:
+            return None
+        allowed = set(among) if among is not None else None
+
+        def ok(name: str) -> bool:
+            return allowed is None or name in allowed
+
+        # 1) exact name or alias
+        name = self.phrases.get(query)
+        if name is not None and ok(name):
+            return name
+
+        # 2) closest phrase within the edit budget, shortlisted by trigrams
+        overlap = Counter()
+        for gram in _trigrams(query):
+            for i in self._index.get(gram, ()):
+                overlap[i] += 1
+        limit = _max_distance(query)
+        best, best_dist = None, limit + 1
+        if limit:
+            shortlist = [i for i, _ in overlap.most_common() if ok(self.phrases[self._keys[i]])]
+            for i in shortlist[:_MAX_CANDIDATES]:
+                dist = edit_distance(query, self._keys[i], limit)
+                if dist < best_dist:
+                    best, best_dist = self.phrases[self._keys[i]], dist
+        if best is not None:
+            return best
+
+        # 3) the only item whose name contains the text as whole words
+        if len(query) >= 3:
+            padded = f" {query} "
+            found = {
+                self.phrases[self._keys[i]] for i in overlap
+                if padded in f" {self._keys[i]} " and ok(self.phrases[self._keys[i]])
+            }
+            if len(found) == 1:
+                return found.pop()
+        return None
+
+
+_matcher: Optional[MenuMatcher] = None
+
+
+def get_matcher(catalog: Optional[MenuCatalog] = None) -> MenuMatcher:
+    """
+    Returns the matcher for a catalog (the current one by default). It is
+    built once and rebuilt only after a menu reload.
+    """
+    global _matcher
+    catalog = catalog or get_catalog()
+    if _matcher is None or _matcher.catalog is not catalog:
+        _matcher = MenuMatcher(catalog)
+    return _matcher
@@ -0,0 +1,51 @@
+"""
+Synonym tables for menu item names.
+
+Kept in one place so the handlers, the fast-path parser and the matchers
+all agree on what "coke" or "oreo mcflurry" means.
+"""
+
+from typing import Dict
+
+# combo slot replies (drinks, fries), used by the slot handler
+SLOT_SYNONYMS: Dict[str, str] = {
+    "coke": "Coca-Cola",
+    "coca cola": "Coca-Cola",
+    "ff": "French Fries",
+    "fries": "French Fries",
+    "potato dips": "Potato Dips",
+    "dip": "Potato Dips",
+}
+
+# dessert names as the LLM tends to spell them, used by add_item
+DESSERT_SYNONYMS: Dict[str, str] = {
+    "oreo mcflurry": "McFlurry with Oreo",
+    "mcflurry with oreo": "McFlurry with Oreo",
+    "m&m's mcflurry": "McFlurry with M&M's",
+    "soft serve cone": "Soft Serve Cone",
+    "soft serve": "Soft Serve Cone",
+    "apple pie": "Apple Pie",
+    "cookie": "Chocolate Chip Cookie",
+    "chocolate chip cookie": "Chocolate Chip Cookie",
+    "sundae": "Sundae",
+}
+
+# item names as the LLM tends to write them, used by the order validator
+NAME_ALIASES: Dict[str, str] = {
+    "Coke": "Coca-Cola",
+    "Sprite Zero": "Sprite",
+    "Fries": "French Fries",
+    "big drink": "Coca-Cola"
+}
+
+# free-text dessert replies, used by the dessert handler
+DESSERT_TEXT_SYNONYMS: Dict[str, str] = {
+    "apple pie": "Apple Pie",
+    "oreomacflurry": "McFlurry with Oreo",
+    "m&m's mcflurry": "McFlurry with M&M's",
+    "soft serve": "Soft Serve Cone",
+    "soft serve cone": "Soft Serve Cone",
+    "cookie": "Chocolate Chip Cookie",
+    "chocolate chip cookie": "Chocolate Chip Cookie",
+    "sundae": "Sundae",
+}
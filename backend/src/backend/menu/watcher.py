@@ -0,0 +1,95 @@
+"""
+Menu hot reload.
+
+MenuWatcher polls the menu YAML files in the background. When their content
+changes it rebuilds the catalog off the event loop and swaps it in, so no
+request ever pays for the reload.
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Optional, Tuple
+from backend.menu.catalog import build_catalog, set_catalog
+from backend.menu.loader import DATA_DIR, content_hash
+
+logger = logging.getLogger(__name__)
+
+Stamp = Tuple[Tuple[str, int, int], ...]
+
+
+def _stat_files(data_dir: Path) -> Stamp:
+    """
+    Cheap change check: (name, mtime_ns, size) of every YAML file.
+    """
+    return tuple(
+        (p.name, st.st_mtime_ns, st.st_size)
+        for p in sorted(data_dir.glob("*.yaml"))
+        for st in (p.stat(),)
+    )
+
+
+class MenuWatcher:
+    """
+    Background task that reloads the menu when the YAML files change.
+
+    mtimes are checked every `interval` seconds. A changed mtime only
+    triggers a rebuild if the content hash changed too, so touching a file
+    or re-saving it unchanged is free. A file that fails to parse (e.g.
+    half-written) is logged and the current catalog stays in place.
+    """
+
+    def __init__(self, interval: float, data_dir: Path = DATA_DIR):
+        self.interval = interval
+        self.data_dir = data_dir
+        self._stamp: Stamp = _stat_files(data_dir)
+        self._hash: str = content_hash(data_dir)
+        self._task: Optional[asyncio.Task] = None
+
+    async def check(self) -> bool:
+        """
+        Reloads the catalog if the menu files changed since the last check.
+
+        Returns:
+            bool: True if a new catalog was swapped in
+        """
+        stamp = await asyncio.to_thread(_stat_files, self.data_dir)
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+
+        new_hash = await asyncio.to_thread(content_hash, self.data_dir)
+        if new_hash == self._hash:
+            return False
+
+        try:
+            catalog = await asyncio.to_thread(build_catalog)
+        except Exception:
+            logger.exception("Menu reload failed, keeping the current catalog")
+            return False
+
+        set_catalog(catalog)
+        self._hash = new_hash
+        logger.info("Menu reloaded (%s)", new_hash[:12])
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception:
+                logger.exception("Menu watcher check failed")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,230 @@
+"""
+Durable order ledger.
+
+Finalized orders are appended to a SQLite database in WAL mode. append()
+only puts the order on a queue; a writer thread commits queued orders in
+batches, so the chat request never waits on disk. Reads use keyset
+pagination over indexed columns, so /orders stays fast however many
+orders a day brings.
+"""
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+from backend.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_id   TEXT NOT NULL UNIQUE,
+    session_id TEXT,
+    created_at REAL NOT NULL,
+    total      REAL NOT NULL,
+    payload    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS orders_session_id ON orders (session_id, seq);
+CREATE INDEX IF NOT EXISTS orders_created_at ON orders (created_at);
+"""
+
+_STOP = object()
+
+
+def _timestamp(value: datetime) -> float:
+    # created_at is stored as UTC, so a time without a zone is read as UTC
+    # rather than as the server's local time
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class OrderLedger:
+    """
+    Append-only order store backed by SQLite.
+
+    Args:
+        path (Path): database file
+        batch_size (int): max orders committed per transaction
+        flush_interval (float): max seconds an order waits in the queue
+    """
+
+    def __init__(self, path: Path, batch_size: int = 200, flush_interval: float = 0.2):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # -- writing --------------------------------------------------------
+
+    def start(self) -> None:
+        """
+        Creates the schema and starts the writer thread (idempotent).
+        """
+        with self._lock:
+            if self._writer is not None:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = _connect(self.path)
+            try:
+                conn.executescript(_SCHEMA)
+            finally:
+                conn.close()
+            self._writer = threading.Thread(target=self._run, name="order-ledger", daemon=True)
+            self._writer.start()
+
+    def stop(self) -> None:
+        """
+        Writes everything still queued and stops the writer thread.
+        """
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(_STOP)
+            writer.join()
+
+    def append(self, order: Dict) -> None:
+        """
+        Queues a finalized order for writing. Returns immediately.
+
+        Args:
+            order (dict): order summary with order_id, session_id, items and total
+        """
+        if self._writer is None:
+            self.start()
+        order = dict(order)
+        order.setdefault("created_at", datetime.now(timezone.utc).isoformat())
+        self._queue.put(order)
+
+    def _run(self) -> None:
+        conn = _connect(self.path)
+        try:
+            stopping = False
+            while not stopping:
+                batch: List[Dict] = []
+                try:
+                    first = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                if first is _STOP:
+                    break
+                batch.append(first)
+                while len(batch) < self.batch_size:
+                    try:
+                        nxt = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if nxt is _STOP:
+                        stopping = True
+                        break
+                    batch.append(nxt)
+                self._write(conn, batch)
+        finally:
+            conn.close()
+
+    def _write(self, conn: sqlite3.Connection, batch: List[Dict]) -> None:
+        rows = [
+            (
+                o["order_id"],
+                o.get("session_id"),
+                _timestamp(datetime.fromisoformat(o["created_at"])),
+                o.get("total", 0.0),
+                json.dumps(o),
+            )
+            for o in batch
+        ]
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO orders (order_id, session_id, created_at, total, payload) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.Error:
+            logger.exception("Failed to write %d orders", len(rows))
+
+    # -- reading --------------------------------------------------------
+
+    def _reader(self) -> sqlite3.Connection:
+        # one read connection per thread; WAL lets reads run alongside the writer
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.start()
+            conn = self._local.conn = _connect(self.path)
+        return conn
+
+    def get(self, order_id: str) -> Optional[Dict]:
+        """
+        Returns one order by its order_id, or None.
+        """
+        row = self._reader().execute(
+            "SELECT payload FROM orders WHERE order_id = ?", (order_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def query(
+        self,
+        limit: int = 50,
+        cursor: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        session_id: Optional[str] = None,
+    ) -> Dict:
+        """
+        Returns a page of orders, newest first.
+
+        Args:
+            limit (int): page size
+            cursor (int): next_cursor from the previous page
+            since (datetime): only orders created at or after this time (UTC if naive)
+            until (datetime): only orders created before this time (UTC if naive)
+            session_id (str): only orders from this chat session
+
+        Returns:
+            dict: {"orders": [...], "next_cursor": int or None}
+        """
+        where, params = [], []
+        if cursor is not None:
+            where.append("seq < ?")
+            params.append(cursor)
+        if since is not None:
+            where.append("created_at >= ?")
+            params.append(_timestamp(since))
+        if until is not None:
+            where.append("created_at < ?")
+            params.append(_timestamp(until))
+        if session_id is not None:
+            where.append("session_id = ?")
+            params.append(session_id)
+
+        sql = "SELECT seq, payload FROM orders"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY seq DESC LIMIT ?"
+        params.append(limit + 1)
+
+        rows = self._reader().execute(sql, params).fetchall()
+        page = rows[:limit]
+        return {
+            "orders": [json.loads(payload) for _, payload in page],
+            "next_cursor": page[-1][0] if len(rows) > limit else None,
+        }
+
+
+ledger = OrderLedger(settings.ORDERS_DB_PATH)
@@ -0,0 +1,78 @@
+"""
+Compact order lines for session state.
+
+session["order"] holds one OrderLine per item. An OrderLine uses __slots__
+rather than a pydantic model's per-instance dict and field bookkeeping, and
+refers to the menu item by its catalog ID instead of holding its own copy
+of the name, which adds up over thousands of live sessions.
+
+Item (llm/schema.py) stays the type at the boundaries: parse results come
+in as Items, finalized orders go out as Item-shaped dicts.
+"""
+
+import sys
+from typing import Dict, Optional, Union
+from backend.llm.schema import Item
+from backend.menu.catalog import get_catalog, item_id, item_name
+
+
+def item_key(name: str) -> Union[int, str]:
+    """
+    Returns what an OrderLine keeps for an item name: its catalog ID
+    (see menu/catalog.py), or the name itself for one no menu lists.
+    """
+    get_catalog()  # IDs are assigned as catalogs are built
+    id_ = item_id(name)
+    return name if id_ is None else id_
+
+
+class OrderLine:
+    """
+    One item in a session's order. Reads like an Item: name, type, size
+    and price are plain attributes.
+
+    Attributes:
+        key (Union[int, str]): the item's catalog ID, from item_key()
+    """
+
+    __slots__ = ("key", "type", "size", "price")
+
+    def __init__(self, name: str, type: str, size: Optional[str] = None, price: Optional[float] = None):
+        self.key = item_key(name)
+        self.type = sys.intern(type)
+        self.size = size
+        self.price = price
+
+    @property
+    def name(self) -> str:
+        return self.key if isinstance(self.key, str) else item_name(self.key)
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self.key = item_key(value)
+
+    @classmethod
+    def from_item(cls, item: Item) -> "OrderLine":
+        return cls(item.name, item.type, item.size, item.price)
+
+    def to_item(self) -> Item:
+        return Item(name=self.name, type=self.type, size=self.size, price=self.price)
+
+    def to_dict(self) -> Dict:
+        """
+        Same shape as Item.model_dump().
+        """
+        return {"name": self.name, "type": self.type, "size": self.size, "price": self.price}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, OrderLine):
+            return NotImplemented
+        return (self.key, self.type, self.size, self.price) == (
+            other.key, other.type, other.size, other.price
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"OrderLine(name={self.name!r}, type={self.type!r}, "
+            f"size={self.size!r}, price={self.price!r})"
+        )
@@ -0,0 +1,126 @@
+"""
+Incremental order aggregate.
+
+session["order"] is an OrderState: the order lines plus counters per item
+type and per item, and the upsells the order is eligible for, all kept up
+to date as lines are added, removed or changed. Questions like "is there a
+burger?" or "can we offer a dessert?" cost the same for a 3-item order and
+a 60-item office lunch.
+
+The total is not kept here: meals change what an order costs, so it comes
+from price_order() (logic/deals.py).
+
+Lines must be changed through OrderState.update() (not by setting their
+attributes directly), so the counters stay in step.
+"""
+
+from collections import Counter
+from typing import FrozenSet, Iterable, Iterator, List, Optional
+from backend.orders.lines import OrderLine, item_key
+
+
+class OrderState:
+    """
+    Ordered collection of OrderLines with running aggregates.
+
+    Attributes:
+        upsells (FrozenSet[str]): process_order_logic() actions the order's
+            contents call for ("offer_combo", "offer_sauce", "offer_dessert",
+            "request_drink_for_combo"), before the session's upsell flags
+    """
+
+    __slots__ = ("_lines", "_types", "_items", "upsells")
+
+    # item types the upsells depend on
+    _UPSELL_TYPES = frozenset({"burger", "combo", "dessert", "drink"})
+
+    def __init__(self, lines: Iterable[OrderLine] = ()):
+        self._lines: List[OrderLine] = []
+        self._types: Counter = Counter()
+        self._items: Counter = Counter()
+        self.upsells: FrozenSet[str] = frozenset()
+        for line in lines:
+            self.append(line)
+
+    # -- reading --------------------------------------------------------
+
+    def __iter__(self) -> Iterator[OrderLine]:
+        return iter(self._lines)
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def __getitem__(self, index: int) -> OrderLine:
+        return self._lines[index]
+
+    def __contains__(self, name: str) -> bool:
+        """
+        Whether an item with this name is in the order.
+        """
+        return self._items[item_key(name)] > 0
+
+    def count(self, *types: str) -> int:
+        """
+        Number of lines of the given item type(s), e.g. count("burger", "combo").
+        """
+        return sum(self._types[t] for t in types)
+
+    def first(self, type_: str) -> Optional[OrderLine]:
+        """
+        The first line of an item type, or None.
+        """
+        if not self._types[type_]:
+            return None
+        return next(line for line in self._lines if line.type == type_)
+
+    # -- changing -------------------------------------------------------
+
+    def _count(self, line: OrderLine, sign: int) -> None:
+        self._types[line.type] += sign
+        self._items[line.key] += sign
+        # eligibility only changes when a type appears or disappears
+        if line.type in self._UPSELL_TYPES and self._types[line.type] == (1 if sign > 0 else 0):
+            self._update_upsells()
+
+    def _update_upsells(self) -> None:
+        types = self._types
+        combo = types["combo"] > 0
+        self.upsells = frozenset(
+            action
+            for action, eligible in (
+                ("offer_combo", types["burger"] > 0),
+                ("offer_sauce", combo),
+                ("offer_dessert", combo and not types["dessert"]),
+                ("request_drink_for_combo", combo and not types["drink"]),
+            )
+            if eligible
+        )
+
+    def append(self, line: OrderLine) -> None:
+        self._lines.append(line)
+        self._count(line, +1)
+
+    def remove(self, line: OrderLine) -> None:
+        """
+        Removes one line (the same object) from the order.
+
+        Raises:
+            ValueError: if the line is not in the order
+        """
+        for i, existing in enumerate(self._lines):
+            if existing is line:
+                del self._lines[i]
+                self._count(line, -1)
+                return
+        raise ValueError(f"{line!r} is not in the order")
+
+    def update(self, line: OrderLine, **changes) -> OrderLine:
+        """
+        Changes attributes of a line in the order, e.g. upgrading a burger:
+        update(line, name="Big Mac Meal", type="combo", price=7.99).
+        """
+        self._count(line, -1)
+        for attr, value in changes.items():
+            setattr(line, attr, value)
+        self._count(line, +1)
+        return line
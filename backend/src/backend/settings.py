@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal, Optional, Set
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -11,6 +12,62 @@ class Settings(BaseSettings):
     # OpenAI
     OPENAI_API_KEY: str
     OPENAI_MODEL: str = "gpt-4o-mini"
+    OPENAI_BASE_URL: Optional[str] = None  # e.g. the local stand-in (llm/standin.py), None for OpenAI
+    OPENAI_TIMEOUT: float = 30.0        # seconds per request
+    OPENAI_MAX_RETRIES: int = 2
+    OPENAI_MAX_CONNECTIONS: int = 100   # pooled HTTP connections per worker
+    OPENAI_MAX_CONCURRENCY: int = 64    # completions in flight per worker
+
+    # Response cache for repeated prompts (0 disables)
+    LLM_CACHE_TTL: float = 600.0
+    LLM_CACHE_MAX_ENTRIES: int = 10_000
+    LLM_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+    # Parsing
+    FAST_PARSE_THRESHOLD: float = 0.9   # min fast-path confidence to skip the LLM, >1 disables
+    PARSE_STRUCTURED_OUTPUT: bool = True  # constrain model replies to the OrderResponse schema
+    PARSE_MAX_RETRIES: int = 1          # extra model calls when a reply still fails validation
+    PARSE_MENU_HINTS: int = 8           # max relevant menu items listed in the parse prompt, 0 disables
+
+    # Batch parsing (llm/batch.py)
+    BATCH_CONCURRENCY: int = 16         # parses in flight
+    BATCH_RATE_LIMIT: float = 10.0      # LLM calls started per second, 0 disables
+
+    # Replies: "template" fills in chat/templates.py, "llm" has the model
+    # write every reply. Keys listed here are model-written in either mode.
+    RESPONSE_MODE: Literal["template", "llm"] = "template"
+    LLM_REWRITE_KEYS: Set[str] = set()
+
+    # Prompt history: recent messages kept verbatim, older ones summarized
+    HISTORY_MAX_MESSAGES: int = 8
+    HISTORY_TOKEN_BUDGET: int = 1000
+
+    # Token budgets (0 disables). Above the soft limit replies use the
+    # templates, a shorter history and a laxer fast-path parse; above the
+    # hard limit every turn gets a fixed reply (chat/budget.py)
+    SESSION_TOKEN_SOFT_LIMIT: int = 20_000
+    SESSION_TOKEN_HARD_LIMIT: int = 50_000
+    WORKER_TOKEN_SOFT_LIMIT: int = 0    # tokens per WORKER_TOKEN_WINDOW
+    WORKER_TOKEN_HARD_LIMIT: int = 0
+    WORKER_TOKEN_WINDOW: float = 60.0   # seconds
+    BUDGET_HISTORY_MESSAGES: int = 2    # messages kept verbatim above the soft limit
+    BUDGET_FAST_PARSE_THRESHOLD: float = 0.5
+
+    # Sessions: idle expiry, LRU caps on count and estimated memory (0 disables)
+    SESSION_TTL: float = 3600.0
+    SESSION_MAX_COUNT: int = 10_000
+    SESSION_MAX_BYTES: int = 256 * 1024 * 1024
+    # "sqlite" shares sessions between workers through SESSION_DB_PATH
+    SESSION_BACKEND: Literal["memory", "sqlite"] = "memory"
+    SESSION_DB_PATH: Path = Path("sessions.db")
+    SESSION_CACHE_SIZE: int = 1000      # sessions cached per worker (sqlite)
+    SESSION_SAVE_RETRIES: int = 2       # turns re-run when another worker saved first
+
+    # Orders
+    ORDERS_DB_PATH: Path = Path("orders.db")
+
+    # Menu
+    MENU_RELOAD_INTERVAL: float = 5.0   # seconds between menu file checks, 0 disables
 
     # Debug
     DEBUG: bool = False
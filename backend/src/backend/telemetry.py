@@ -0,0 +1,292 @@
+"""
+Tracing and Prometheus metrics for the chat pipeline.
+
+Each chat turn gets a Trace: the spans opened while handling it (handler,
+parse, generation, validation, order logic) with their durations and
+attributes, plus turn attributes such as the handler that answered, the
+LLM calls made and the tokens used. Finished traces are logged at DEBUG
+on the "backend.trace" logger.
+
+Span and turn durations also feed latency histograms, and the registry
+renders everything in the Prometheus text format for GET /metrics. No
+client library needed.
+"""
+
+import functools
+import inspect
+import json
+import logging
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("backend.trace")
+
+LabelValues = Tuple[str, ...]
+
+# seconds; chat turns range from sub-millisecond template replies to
+# multi-second LLM round trips
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _labels(names: Tuple[str, ...], values: LabelValues) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{n}="{str(v)}"'.replace("\\", "\\\\").replace("\n", "\\n") for n, v in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class Counter:
+    """
+    Monotonic counter, optionally labelled.
+    """
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, *labels: str) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterator[str]:
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{_labels(self.label_names, labels)} {value:g}"
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram, optionally labelled.
+    """
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self.buckets = tuple(buckets)
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        # per label set: one count per bucket, then +Inf, then the sum
+        state = self._values.get(labels)
+        if state is None:
+            state = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def samples(self) -> Iterator[str]:
+        for labels, state in sorted(self._values.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                names = self.label_names + ("le",)
+                yield f"{self.name}_bucket{_labels(names, labels + (le,))} {cumulative:g}"
+            yield f"{self.name}_sum{_labels(self.label_names, labels)} {state[-1]:g}"
+            yield f"{self.name}_count{_labels(self.label_names, labels)} {cumulative:g}"
+
+
+class Registry:
+    """
+    Metrics plus gauge collectors, rendered for Prometheus.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._collectors: List[Tuple[str, str, Callable[[], Dict]]] = []
+
+    def counter(self, name: str, help: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, help, labels, buckets))
+
+    def add_collector(self, prefix: str, help: str, stats: Callable[[], Dict]) -> None:
+        """
+        Exposes every numeric value of stats() as a gauge named
+        <prefix>_<key>, read at scrape time (e.g. SessionStore.stats).
+        """
+        self._collectors.append((prefix, help, stats))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        for prefix, help, stats in self._collectors:
+            for key, value in stats().items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    name = f"{prefix}_{key}"
+                    lines.append(f"# HELP {name} {help}")
+                    lines.append(f"# TYPE {name} gauge")
+                    lines.append(f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+TURN_SECONDS = registry.histogram(
+    "chat_turn_duration_seconds", "Chat turn latency by answering handler", ("handler",)
+)
+SPAN_SECONDS = registry.histogram(
+    "chat_span_duration_seconds", "Latency of pipeline steps within a turn", ("span",)
+)
+LLM_CALLS = registry.counter(
+    "llm_requests_total", "Chat completion requests sent", ("outcome",)
+)
+LLM_SECONDS = registry.histogram(
+    "llm_request_duration_seconds", "Chat completion latency (time to first byte when streaming)"
+)
+LLM_TOKENS = registry.counter(
+    "llm_tokens_total", "Tokens reported by the API", ("kind",)
+)
+
+
+# -- tracing ------------------------------------------------------------
+
+
+class Span:
+    __slots__ = ("name", "start", "duration", "attrs")
+
+    def __init__(self, name: str, attrs: Dict):
+        self.name = name
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.attrs = attrs
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+
+class Trace:
+    """
+    Everything recorded during one chat turn.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.spans: List[Span] = []
+        self.attrs: Dict = {"llm_calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+    def as_dict(self) -> Dict:
+        return {
+            **self.attrs,
+            "duration_ms": round((time.perf_counter() - self.start) * 1000, 2),
+            "spans": [
+                {
+                    "name": s.name,
+                    "offset_ms": round((s.start - self.start) * 1000, 2),
+                    "duration_ms": round(s.duration * 1000, 2),
+                    **s.attrs,
+                }
+                for s in self.spans
+            ],
+        }
+
+
+_trace: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+_span: ContextVar[Optional[Span]] = ContextVar("span", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _trace.get()
+
+
+def current_span() -> Optional[Span]:
+    return _span.get()
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[Span]:
+    """
+    Times a pipeline step: recorded in the turn's trace (if any) and in
+    chat_span_duration_seconds.
+    """
+    s = Span(name, attrs)
+    token = _span.set(s)
+    try:
+        yield s
+    finally:
+        _span.reset(token)
+        s.duration = time.perf_counter() - s.start
+        SPAN_SECONDS.observe(s.duration, name)
+        trace = _trace.get()
+        if trace is not None:
+            trace.spans.append(s)
+
+
+def traced(name: str):
+    """
+    Decorator running a function (sync or async) inside span(name).
+    """
+    def decorate(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def turn() -> Iterator[Trace]:
+    """
+    Starts the trace for one chat turn. The handler that answered should
+    be set as trace.attrs["handler"].
+    """
+    trace = Trace()
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+        duration = time.perf_counter() - trace.start
+        TURN_SECONDS.observe(duration, trace.attrs.get("handler", "none"))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(json.dumps(trace.as_dict()))
+
+
+def record_llm_call(duration: float, usage=None, error: bool = False) -> None:
+    """
+    Counts one chat completion request, its latency and its tokens, for
+    the metrics and the current turn.
+    """
+    LLM_CALLS.inc(1, "error" if error else "ok")
+    LLM_SECONDS.observe(duration)
+    trace = _trace.get()
+    if trace is not None:
+        trace.attrs["llm_calls"] += 1
+    if usage is not None:
+        record_tokens(usage)
+
+
+def record_tokens(usage) -> None:
+    """
+    Adds an API usage object (prompt_tokens, completion_tokens) to the
+    token counters and the current turn.
+    """
+    prompt = getattr(usage, "prompt_tokens", 0) or 0
+    completion = getattr(usage, "completion_tokens", 0) or 0
+    LLM_TOKENS.inc(prompt, "prompt")
+    LLM_TOKENS.inc(completion, "completion")
+    trace = _trace.get()
+    if trace is not None:
+        trace.attrs["prompt_tokens"] += prompt
+        trace.attrs["completion_tokens"] += completion
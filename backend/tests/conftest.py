@@ -0,0 +1,63 @@
+import asyncio
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+# settings.py requires a key; the tests never reach the API
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+
+class FakeLLM:
+    """
+    Stands in for the OpenAI client: parse prompts are answered from
+    `parses` (message -> OrderResponse dict, else a clarification request),
+    every other prompt with a fixed reply. Counts the calls it gets.
+    """
+
+    REPLY = "Sure thing, anything else?"
+
+    def __init__(self, latency: float = 0.0, usage=(100, 20)):
+        self.latency = latency
+        self.usage = SimpleNamespace(prompt_tokens=usage[0], completion_tokens=usage[1])
+        self.parses = {}
+        self.calls = {"parse": 0, "reply": 0}
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        messages = kwargs["messages"]
+        if "response_format" in kwargs or "extract structured order" in messages[0]["content"]:
+            self.calls["parse"] += 1
+            order = self.parses.get(messages[-1]["content"], {"items": [], "intents": ["ask_for_clarification"]})
+            text = json.dumps(order)
+        else:
+            self.calls["reply"] += 1
+            text = self.REPLY
+        await asyncio.sleep(self.latency)
+        if kwargs.get("stream"):
+            return self._stream(text, kwargs.get("stream_options") or {})
+        message = SimpleNamespace(content=text)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=message, finish_reason="stop")], usage=self.usage
+        )
+
+    async def _stream(self, text, options):
+        for word in text.split(" "):
+            await asyncio.sleep(self.latency / 10)
+            delta = SimpleNamespace(content=word + " ")
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+        if options.get("include_usage"):
+            yield SimpleNamespace(choices=[], usage=self.usage)
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    from backend.llm import client
+    from backend.llm.cache import response_cache
+
+    llm = FakeLLM()
+    monkeypatch.setattr(client, "get_client", lambda: llm)
+    response_cache.clear()
+    yield llm
+    response_cache.clear()
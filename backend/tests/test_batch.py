@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+from backend.llm.batch import parse_batch
+from backend.llm.client import before_call
+from backend.llm.order_parser import parser_order
+
+ORDER = {"items": [{"name": "Big Tasty", "type": "burger", "size": None, "price": None}], "intents": ["add_item"]}
+
+
+def run_batch(inputs, **kwargs):
+    async def run():
+        return [result async for result in parse_batch(inputs, **kwargs)]
+    return sorted(asyncio.run(run()))
+
+
+def test_duplicates_are_parsed_once_into_separate_copies(fake_llm):
+    message = "I'd like the tasty one please"
+    fake_llm.parses[message] = ORDER
+
+    results = run_batch([(message, None)] * 3 + [("something else entirely", None)], rate=0)
+
+    assert fake_llm.calls["parse"] == 2
+    assert [r.index for r in results] == [0, 1, 2, 3]
+    orders = [r.order for r in results[:3]]
+    assert all(o == orders[0] for o in orders)
+    assert len({id(o) for o in orders}) == 3
+    orders[0].items[0].name = "changed"
+    assert orders[1].items[0].name == "Big Tasty"
+
+
+def test_model_calls_are_rate_limited(fake_llm):
+    inputs = [(f"something vague number {i}", None) for i in range(5)]
+
+    start = time.monotonic()
+    run_batch(inputs, concurrency=1, rate=20)
+
+    # one call from the burst, the other four at 20 per second
+    assert fake_llm.calls["parse"] == 5
+    assert time.monotonic() - start >= 4 / 20 - 0.01
+
+
+def test_every_model_call_waits_for_the_gate(fake_llm):
+    gated = []
+
+    async def gate():
+        gated.append(fake_llm.calls["parse"])
+
+    async def run():
+        reset = before_call.set(gate)
+        try:
+            await parser_order("a big mac", history=None)       # fast path
+            await parser_order("give me the usual thing")       # clarification, cached
+            await parser_order("give me the usual thing")       # cache hit
+            retried = await parser_order("the weird one")       # invalid, then retried
+            assert retried.intents == ["ask_for_clarification"]
+        finally:
+            before_call.reset(reset)
+
+    fake_llm.parses["the weird one"] = "not an order"
+    asyncio.run(run())
+
+    # the cached and fast-path parses never reach the gate; the retry does
+    assert gated == [0, 1, 2]
+    assert fake_llm.calls["parse"] == 3
@@ -0,0 +1,41 @@
+import asyncio
+
+from backend.chat.service import ChatService, sessions
+from backend.chat.templates import TEMPLATES
+from backend.settings import settings
+
+
+def test_hard_budget_still_finishes_the_order(fake_llm, monkeypatch):
+    async def run():
+        svc = ChatService()
+        sid = (await svc.handle(None, "hi"))["session_id"]
+        session = await sessions.get(sid)
+        session["usage"]["prompt_tokens"] = settings.SESSION_TOKEN_HARD_LIMIT
+
+        replies = {}
+        for message in ["big mac", "yes", "coke", "hmm", "no dessert", "done"]:
+            replies[message] = await svc.handle(sid, message)
+        return replies
+
+    replies = asyncio.run(run())
+    assert replies["coke"]["response"].startswith("Got it! Coca-Cola added")
+    assert replies["hmm"]["response"] == TEMPLATES["budget.exhausted"].text
+    assert replies["done"]["finalized"]
+    assert fake_llm.calls == {"parse": 0, "reply": 0}
+
+
+def test_cancelled_speculative_stream_is_charged(fake_llm, monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_MODE", "llm")
+    fake_llm.latency = 0.05
+
+    async def run():
+        svc, sid = ChatService(), None
+        for message in ["hi", "big mac", "no"]:  # the predicted combo reply is discarded
+            sid = (await svc.handle(sid, message))["session_id"]
+        return (await sessions.get(sid))["usage"]
+
+    usage = asyncio.run(run())
+    # two replies were written in full (greeting, combo.decline), plus the
+    # speculative one cut short
+    assert fake_llm.calls["reply"] == 3
+    assert usage["prompt_tokens"] > 2 * fake_llm.usage.prompt_tokens
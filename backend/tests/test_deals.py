@@ -0,0 +1,111 @@
+import itertools
+import random
+
+import pytest
+
+from backend.logic.deals import price_order
+from backend.logic.order_engine import process_order_logic
+from backend.menu.catalog import get_catalog
+from backend.orders.lines import OrderLine
+
+
+@pytest.fixture
+def catalog():
+    return get_catalog()
+
+
+def line(name, type_, catalog):
+    return OrderLine(name, type_, price=catalog.price(name))
+
+
+def test_combo_includes_only_its_drink(catalog):
+    order = [
+        line("Big Mac Meal", "combo", catalog),
+        line("Coca-Cola", "drink", catalog),
+        line("French Fries", "fries", catalog),
+    ]
+    pricing = price_order(order, catalog)
+    assert pricing.subtotal == 11.27
+    assert pricing.total == 9.98
+    assert pricing.bundles[0].items == ("Big Mac Meal", "Coca-Cola")
+
+
+def test_combo_does_not_absorb_fries(catalog):
+    order = [line("Big Mac Meal", "combo", catalog), line("French Fries", "fries", catalog)]
+    assert price_order(order, catalog).total == 9.98
+
+
+def test_burger_with_sides_is_charged_as_meal(catalog):
+    order = [
+        line("Big Mac", "burger", catalog),
+        line("French Fries", "fries", catalog),
+        line("Coca-Cola", "drink", catalog),
+    ]
+    pricing = price_order(order, catalog)
+    assert pricing.subtotal == 9.27
+    assert pricing.total == 7.99
+    assert pricing.bundles[0].name == "Big Mac Meal"
+    assert set(pricing.bundles[0].items) == {"Big Mac", "French Fries", "Coca-Cola"}
+
+
+def test_burger_without_both_sides_stays_a_burger(catalog):
+    order = [line("Big Mac", "burger", catalog), line("Coca-Cola", "drink", catalog)]
+    pricing = price_order(order, catalog)
+    assert pricing.total == 7.28
+    assert pricing.bundles == ()
+
+
+def test_combo_and_promoted_burger_share_sides(catalog):
+    order = [
+        line("Big Mac Meal", "combo", catalog),
+        line("Coca-Cola", "drink", catalog),
+        line("Cheeseburger", "burger", catalog),
+        line("French Fries", "fries", catalog),
+        line("Sprite", "drink", catalog),
+    ]
+    # the combo takes one drink; the cheeseburger becomes a meal with the rest
+    assert price_order(order, catalog).total == round(7.99 + 5.49, 2)
+
+
+def test_two_burgers_are_charged_as_ordered(catalog):
+    # the shipped double deals have no price
+    order = [line("Big Mac", "burger", catalog), line("Big Tasty", "burger", catalog)]
+    assert price_order(order, catalog).total == 12.98
+
+    result = process_order_logic(
+        {"items": order, "intents": [], "errors": [], "is_valid": True}, {"combo_offered": True}
+    )
+    assert "apply_double_deal" not in result["actions"]
+
+
+def _brute_force(order, catalog):
+    # every subset of burgers as meals, each meal with the dearest sides left
+    combos = [l for l in order if l.type == "combo"]
+    burgers = [l for l in order if l.type == "burger" and f"{l.name} Meal" in catalog.combo_slots]
+    drinks = sorted((l.price for l in order if l.type == "drink"), reverse=True)
+    fries = sorted((l.price for l in order if l.type == "fries"), reverse=True)
+    subtotal = sum(l.price for l in order)
+    best = subtotal - sum(drinks[:len(combos)])
+    for n in range(1, len(burgers) + 1):
+        if len(combos) + n > len(drinks) or n > len(fries):
+            break
+        absorbed = sum(drinks[:len(combos) + n]) + sum(fries[:n])
+        for meals in itertools.combinations(burgers, n):
+            premium = sum(catalog.price(f"{b.name} Meal") - b.price for b in meals)
+            best = min(best, subtotal - absorbed + premium)
+    return round(best, 2)
+
+
+def test_matches_brute_force_on_random_orders(catalog):
+    rng = random.Random(7)
+    burgers = [n for n in catalog.names_in("burgers") if n not in catalog.combo_slots]
+    drinks = list(catalog.combo_slots["Big Mac Meal"]["drinks"])
+    fries = list(catalog.combo_slots["Big Mac Meal"]["fries"])
+    for _ in range(200):
+        order = (
+            [line(rng.choice(burgers), "burger", catalog) for _ in range(rng.randint(0, 6))]
+            + [line("Big Mac Meal", "combo", catalog) for _ in range(rng.randint(0, 2))]
+            + [line(rng.choice(drinks), "drink", catalog) for _ in range(rng.randint(0, 5))]
+            + [line(rng.choice(fries), "fries", catalog) for _ in range(rng.randint(0, 5))]
+        )
+        assert price_order(order, catalog).total == _brute_force(order, catalog)
@@ -0,0 +1,69 @@
+import asyncio
+
+from backend.chat.service import ChatService
+from backend.llm.fast_parser import fast_parse
+from backend.settings import settings
+
+
+def after(reply):
+    return [{"role": "system", "content": reply}]
+
+
+def test_no_after_combo_offer_declines():
+    history = after("✅ Added: Big Mac – $5.99\nWould you like to make your Big Mac a combo?")
+    parsed = fast_parse("no", history)
+    assert parsed.order.intents == ["decline_combo"]
+    assert parsed.confidence >= settings.FAST_PARSE_THRESHOLD
+
+
+def test_no_after_combo_summary_is_not_a_combo_answer():
+    history = after(
+        "Got it! Coca-Cola added to your combo.\n🧾 Current items:\n"
+        "- Big Mac Meal: $7.99\n- Coca-Cola: $1.29\nWould you like to add anything else?"
+    )
+    assert fast_parse("no", history).order.intents == ["finalize_order"]
+
+
+def test_yes_after_dessert_offer():
+    history = after("Would you like to add a dessert? Here are our options: Apple Pie, Vanilla Cone")
+    assert fast_parse("yes", history).order.intents == ["accept_dessert"]
+
+
+def test_yes_after_rewritten_reply_goes_to_the_model():
+    history = after("Fancy turning that Big Mac into a meal with fries and a drink?")
+    assert fast_parse("yes", history).confidence < settings.FAST_PARSE_THRESHOLD
+
+
+def test_no_after_completed_combo_does_not_undo_it():
+    async def run():
+        svc, sid = ChatService(), None
+        for message in ["hi", "big mac", "yes", "coke", "no"]:
+            result = await svc.handle(sid, message)
+            sid = result["session_id"]
+        return result
+
+    assert "Keeping your burger" not in asyncio.run(run())["response"]
+
+
+def test_meal_phrases_parse_to_valid_combos():
+    from backend.logic.order_validator import validate_order
+
+    for message in ["a big mac meal", "big mac combo", "mcchicken meal please"]:
+        parsed = fast_parse(message)
+        assert [it.type for it in parsed.order.items] == ["combo"], message
+        assert parsed.confidence >= settings.FAST_PARSE_THRESHOLD, message
+        assert validate_order(parsed.order)["is_valid"], message
+
+
+def test_parse_the_validator_rejects_goes_to_the_model():
+    parsed = fast_parse("a coke")  # no size
+    assert parsed.confidence < settings.FAST_PARSE_THRESHOLD
+
+
+def test_ordering_a_meal_adds_it():
+    async def run():
+        svc = ChatService()
+        first = await svc.handle(None, "hi")
+        return await svc.handle(first["session_id"], "a big mac meal")
+
+    assert "Added: Big Mac Meal" in asyncio.run(run())["response"]
@@ -0,0 +1,67 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.orders.ledger import OrderLedger
+
+START = datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = OrderLedger(tmp_path / "orders.db", flush_interval=0.01)
+    yield ledger
+    ledger.stop()
+
+
+def fill(ledger, count):
+    # one order per hour from START, oldest first
+    for i in range(count):
+        ledger.append({
+            "order_id": f"o{i}",
+            "session_id": "s1" if i % 2 == 0 else "s2",
+            "created_at": (START + timedelta(hours=i)).isoformat(),
+            "total": 5.0,
+        })
+    ledger.stop()  # flushes the queue
+
+
+def test_cursor_pages_through_every_order(ledger):
+    fill(ledger, 7)
+
+    seen, cursor = [], None
+    while True:
+        page = ledger.query(limit=3, cursor=cursor)
+        seen += [o["order_id"] for o in page["orders"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [f"o{i}" for i in range(6, -1, -1)]
+    assert ledger.query(limit=7)["next_cursor"] is None
+
+
+def test_time_and_session_filters(ledger):
+    fill(ledger, 6)
+
+    page = ledger.query(since=START + timedelta(hours=2), until=START + timedelta(hours=5))
+    assert [o["order_id"] for o in page["orders"]] == ["o4", "o3", "o2"]
+
+    page = ledger.query(session_id="s1")
+    assert [o["order_id"] for o in page["orders"]] == ["o4", "o2", "o0"]
+
+
+def test_naive_times_are_utc(ledger, monkeypatch):
+    fill(ledger, 6)
+    # a server well away from UTC
+    monkeypatch.setenv("TZ", "Etc/GMT+5")
+    time.tzset()
+    try:
+        naive = START.replace(tzinfo=None)
+        page = ledger.query(since=naive + timedelta(hours=2), until=naive + timedelta(hours=5))
+    finally:
+        monkeypatch.delenv("TZ")
+        time.tzset()
+
+    assert [o["order_id"] for o in page["orders"]] == ["o4", "o3", "o2"]
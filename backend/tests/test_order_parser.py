@@ -0,0 +1,24 @@
+from backend.llm.order_parser import build_messages
+from backend.llm.schema import Item, OrderResponse
+from backend.logic.order_validator import types_with_size, validate_order
+from backend.menu.catalog import get_catalog
+
+
+def hinted_items(message):
+    hint = build_messages(message)[-2]["content"]
+    listed = hint.split(": ", 1)[1].split("; ")
+    return [entry.rsplit(" (", 1) for entry in listed]
+
+
+def test_menu_hint_types_pass_validation():
+    catalog = get_catalog()
+    for message in ["big mac meal", "a mcchicken combo and a coke", "got any desserts?"]:
+        for name, type_ in hinted_items(message):
+            type_ = type_.rstrip(")")
+            size = "medium" if catalog.get(name).get("category") in types_with_size else None
+            order = OrderResponse(items=[Item(name=name, type=type_, size=size)], intents=["add_item"])
+            assert validate_order(order, catalog)["is_valid"], (name, type_)
+
+
+def test_meal_is_hinted_as_combo():
+    assert ["Big Mac Meal", "combo)"] in hinted_items("big mac meal")
@@ -0,0 +1,89 @@
+import copy
+
+from backend.llm.schema import Item, OrderResponse
+from backend.logic.order_engine import process_order_logic
+from backend.logic.order_validator import validate_order
+from backend.menu import catalog as catalog_module
+from backend.menu.catalog import MenuCatalog, get_catalog, item_id
+from backend.orders.lines import OrderLine
+from backend.orders.state import OrderState
+
+
+def test_membership_tracks_lines():
+    order = OrderState([OrderLine("Big Mac", "burger", price=5.69)])
+    assert "Big Mac" in order
+    assert "French Fries" not in order
+
+    order.remove(order[0])
+    assert "Big Mac" not in order
+
+
+def test_lines_refer_to_catalog_ids():
+    line = OrderLine("Big Mac", "burger", price=5.69)
+    assert line.key == item_id("Big Mac")
+    assert line.name == "Big Mac"
+
+
+def test_off_menu_names_are_not_registered():
+    order = OrderState([OrderLine("Big Mac", "burger", price=5.69)])
+    before = len(catalog_module._item_names)
+
+    for i in range(100):
+        assert f"Not On The Menu {i}" not in order
+    off_menu = OrderLine("Not On The Menu", "burger")
+
+    assert len(catalog_module._item_names) == before
+    assert off_menu.name == "Not On The Menu"
+    assert item_id("Not On The Menu") is None
+
+
+def test_ids_survive_a_menu_reload():
+    line = OrderLine("Big Mac", "burger", price=5.69)
+    menus = copy.deepcopy(get_catalog().menus)
+    menus["virtual_items"]["items"] = [
+        entry for entry in menus["virtual_items"]["items"] if entry["name"] != "Big Mac"
+    ]
+    MenuCatalog(menus)
+
+    assert line.name == "Big Mac"
+    assert item_id("Big Mac") == line.key
+
+
+def test_sizes_must_be_on_the_menu():
+    def validate(size):
+        return validate_order(OrderResponse(items=[Item(name="Coca-Cola", type="drink", size=size)]))
+
+    assert validate("Large")["items"][0].size == "large"
+
+    result = validate("venti")
+    assert not result["is_valid"]
+    assert "Unknown size 'venti'" in result["errors"][0]
+
+
+def test_upsells_follow_changes():
+    order = OrderState()
+    assert order.upsells == frozenset()
+
+    burger = OrderLine("Big Mac", "burger", price=5.69)
+    order.append(burger)
+    assert order.upsells == {"offer_combo"}
+
+    order.update(burger, name="Big Mac Meal", type="combo", price=7.99)
+    assert order.upsells == {"offer_sauce", "offer_dessert", "request_drink_for_combo"}
+
+    drink = OrderLine("Coca-Cola", "drink", price=1.29)
+    order.append(drink)
+    order.append(OrderLine("Apple Pie", "dessert", price=1.29))
+    assert order.upsells == {"offer_sauce"}
+
+    order.remove(drink)
+    assert order.upsells == {"offer_sauce", "request_drink_for_combo"}
+
+
+def test_process_order_logic_reads_upsells():
+    order = OrderState([OrderLine("Big Mac Meal", "combo", price=7.99)])
+    result = process_order_logic(
+        {"items": order, "intents": [], "errors": [], "is_valid": True},
+        {"combo_offered": True, "sauce_offered": True},
+    )
+    assert result["actions"] == ["offer_dessert", "request_drink_for_combo"]
@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+
+from backend.chat import service
+from backend.chat.handlers import finalize
+from backend.chat.session_store import (
+    SessionConflict,
+    SqliteSessionStore,
+    dumps,
+    loads,
+    new_session,
+)
+from backend.orders.lines import OrderLine
+
+
+def make_session():
+    session = new_session()
+    session["history"].append({"role": "system", "content": "Would you like to make your Big Mac a combo?"})
+    session["order"].append(OrderLine("Big Mac Meal", "combo", price=7.99))
+    session["order"].append(OrderLine("Coca-Cola", "drink", "large", 1.29))
+    session["upsell_flags"]["combo_offered"] = True
+    session["pending_slots"] = {"slot": "drinks", "options": ["Coca-Cola"], "combo": "Big Mac Meal", "remaining": []}
+    return session
+
+
+def test_dumps_loads_round_trip():
+    session = make_session()
+    restored = loads(dumps(session), version=3)
+
+    assert list(restored["order"]) == list(session["order"])
+    assert restored["order"].upsells == session["order"].upsells
+    assert restored["order"].count("combo") == 1
+    for key in ("history", "upsell_flags", "pending_slots", "usage"):
+        assert restored[key] == session[key]
+    assert restored["version"] == 3
+
+
+def test_compare_and_set(tmp_path):
+    async def run():
+        a = SqliteSessionStore(tmp_path / "s.db")
+        b = SqliteSessionStore(tmp_path / "s.db")
+
+        await a.save("s1", make_session())
+        with pytest.raises(SessionConflict):
+            await b.save("s1", new_session())  # a second "new" session
+
+        first, second = await a.get("s1"), await b.get("s1")
+        await a.save("s1", first)
+        with pytest.raises(SessionConflict):
+            await b.save("s1", second)  # read before a's save
+
+        fresh = await b.get("s1")
+        assert fresh["version"] == 2
+        await b.save("s1", fresh)
+        assert (await a.get("s1"))["version"] == 3
+
+    asyncio.run(run())
+
+
+def test_read_cache_checks_the_version(tmp_path):
+    async def run():
+        a = SqliteSessionStore(tmp_path / "s.db")
+        b = SqliteSessionStore(tmp_path / "s.db")
+        session = make_session()
+        await a.save("s1", session)
+
+        assert await a.get("s1") is session  # unchanged: served from the cache
+        await a.save("s1", session)
+        other = await b.get("s1")
+        other["upsell_flags"]["dessert_offered"] = True
+        await b.save("s1", other)
+
+        reloaded = await a.get("s1")
+        assert reloaded is not session
+        assert reloaded["upsell_flags"]["dessert_offered"]
+        assert a.stats()["cache_hits"] == 1
+
+    asyncio.run(run())
+
+
+def test_expired_session_is_replaced(tmp_path):
+    async def run():
+        store = SqliteSessionStore(tmp_path / "s.db", ttl=0.01)
+        await store.save("s1", make_session())
+        await asyncio.sleep(0.02)
+        assert await store.get("s1") is None
+        await store.save("s1", new_session())
+        assert len((await store.get("s1"))["order"]) == 0
+
+    asyncio.run(run())
+
+
+class RacedStore(SqliteSessionStore):
+    """
+    Store whose next `races` saves lose to another worker saving first.
+    """
+
+    races = 0
+
+    async def save(self, session_id, session):
+        if self.races:
+            self.races -= 1
+            rival = SqliteSessionStore(self.path)
+            await rival.save(session_id, await rival.get(session_id))
+        await super().save(session_id, session)
+
+
+@pytest.fixture
+def raced(tmp_path, monkeypatch):
+    store = RacedStore(tmp_path / "s.db")
+    orders = []
+    monkeypatch.setattr(service, "sessions", store)
+    monkeypatch.setattr(finalize.ledger, "append", orders.append)
+    return store, orders
+
+
+ORDER = ["big mac", "yes", "coke", "no dessert"]
+
+
+def test_conflicting_turn_is_rerun_and_places_one_order(fake_llm, raced):
+    store, orders = raced
+
+    async def run():
+        svc = service.ChatService()
+        sid = (await svc.handle(None, "hi"))["session_id"]
+        for message in ORDER:
+            await svc.handle(sid, message)
+        store.races = 1
+        return await svc.handle(sid, "done")
+
+    result = asyncio.run(run())
+    assert result["finalized"]
+    assert orders == [result["order"]]
+    assert store.stats()["conflicts"] == 1
+
+
+def test_conflicting_streamed_turn_is_not_rerun(fake_llm, raced):
+    store, orders = raced
+
+    async def run():
+        svc = service.ChatService()
+        sid = (await svc.handle(None, "hi"))["session_id"]
+        for message in ORDER:
+            await svc.handle(sid, message)
+        store.races = 1
+        return [frame async for frame in svc.handle_stream(sid, "done")]
+
+    with pytest.raises(SessionConflict):
+        asyncio.run(run())
+    assert orders == []
+    assert store.stats()["conflicts"] == 1
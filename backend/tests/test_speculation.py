@@ -0,0 +1,51 @@
+import asyncio
+
+from backend.chat import speculation
+from backend.chat.service import ChatService
+from backend.settings import settings
+
+
+async def converse(messages, svc=None, sid=None):
+    svc = svc or ChatService()
+    result = None
+    for message in messages:
+        result = await svc.handle(sid, message)
+        sid = result["session_id"]
+    return svc, sid, result
+
+
+def test_combo_reply_uses_speculation_after_history_is_folded(fake_llm, monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_MODE", "llm")
+    fake_llm.latency = 0.01
+    # enough turns that the prompt history starts with a summary
+    turns = ["hi"] + ["hmm"] * settings.HISTORY_MAX_MESSAGES + ["big mac"]
+
+    async def run():
+        svc, sid, _ = await converse(turns)
+        used, replies = speculation.stats["used"], fake_llm.calls["reply"]
+        await converse(["yes"], svc, sid)
+        return speculation.stats["used"] - used, fake_llm.calls["reply"] - replies
+
+    used, replies = asyncio.run(run())
+    assert used == 1
+    assert replies == 1  # the speculative reply was the only one written
+
+
+def test_discarded_speculation_is_finished_with_the_turn(fake_llm, monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_MODE", "llm")
+    fake_llm.latency = 0.05
+    seen = []
+    original = speculation.start
+
+    def start(ctx):
+        spec = original(ctx)
+        if spec is not None:
+            seen.append(spec)
+        return spec
+
+    monkeypatch.setattr(speculation, "start", start)
+    asyncio.run(converse(["hi", "big mac", "no"]))
+
+    assert len(seen) == 1
+    assert not seen[0].used
+    assert seen[0].task.done()
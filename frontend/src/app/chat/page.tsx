@@ -84,8 +84,18 @@ export default function ChatPage() {
 
     const chat = chats.find(c => c.id === activeChat);
     if (!chat) return;
+    const chatId = activeChat;
+
+    // Replace the text of the streaming reply (always the last message)
+    const setReply = (text: string) => setChats(prev => prev.map(c => {
+      if (c.id !== chatId) return c;
+      const messages = [...c.messages];
+      messages[messages.length - 1] = { sender: 'system', text, llm: true };
+      return { ...c, messages };
+    }));
+
     try {
-      const res = await fetch('http://localhost:8000/chat', {
+      const res = await fetch('http://localhost:8000/chat/stream', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
@@ -93,10 +103,47 @@ export default function ChatPage() {
           message: input
         })
       });
-      const data = await res.json();
+      if (!res.ok || !res.body) throw new Error(`HTTP ${res.status}`);
+
+      setChats(prev => prev.map(c =>
+        c.id === chatId
+          ? { ...c, messages: [...c.messages, { sender: 'system', text: '', llm: true }] }
+          : c
+      ));
+
+      // Server-sent events: "token" frames while the reply is generated,
+      // then one "done" frame with the full response and order
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let reply = '';
+      let data: any = null;
+      while (data === null) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        let sep;
+        while ((sep = buffer.indexOf('\n\n')) !== -1) {
+          const frame = buffer.slice(0, sep);
+          buffer = buffer.slice(sep + 2);
+          const event = frame.match(/^event: (.*)$/m)?.[1];
+          const payload = JSON.parse(frame.match(/^data: (.*)$/m)?.[1] ?? 'null');
+          if (event === 'token') {
+            reply += payload.text;
+            setReply(reply);
+          } else if (event === 'done') {
+            data = payload;
+          } else if (event === 'error') {
+            throw new Error(payload?.detail);
+          }
+        }
+      }
+      if (data === null) throw new Error('Stream ended early');
+
       setChats(prev => prev.map(c => {
-        if (c.id !== activeChat) return c;
-        const newMessages = [...c.messages, { sender: 'system', text: data.response, llm: true }];
+        if (c.id !== chatId) return c;
+        const newMessages = [...c.messages];
+        newMessages[newMessages.length - 1] = { sender: 'system', text: data.response, llm: true };
         return {
           ...c,
           session_id: data.session_id,
@@ -108,10 +155,14 @@ export default function ChatPage() {
       }));
     } catch (e) {
       setChats(prev => prev.map(c =>
-        c.id === activeChat
+        c.id === chatId
           ? {
               ...c,
-              messages: [...c.messages, { sender: 'system', text: 'Error: Could not reach backend.', llm: false }],
+              // drop a half-streamed reply before showing the error
+              messages: [
+                ...c.messages.filter((m, i) => !(i === c.messages.length - 1 && m.sender === 'system' && m.llm)),
+                { sender: 'system', text: 'Error: Could not reach backend.', llm: false }
+              ],
               isLoading: false
             }
           : c